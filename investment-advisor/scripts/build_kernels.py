@@ -0,0 +1,61 @@
+"""
+Compilación AOT de los kernels numéricos del comité (numba.pycc)
+
+Con @njit(cache=True) la primera ejecución en una máquina limpia (p.ej. el runner de
+GitHub Actions) paga la compilación JIT de cada kernel. Este script genera una
+extensión nativa src/committee/_aot_kernels.*.so con los kernels escalares ya
+compilados; turtles.py, seykota.py, catalyst.py y risk_reward.py la usan si existe
+y, si no, caen al kernel @njit (o a Python puro sin numba).
+
+Uso (desde investment-advisor/):
+    python scripts/build_kernels.py
+
+Requiere numba con numba.pycc y un compilador de C. El .so es específico de la
+plataforma y de la versión de Python: no se versiona (ver .gitignore). Hay que
+regenerarlo después de modificar cualquiera de los kernels.
+
+Por defecto se compila para la CPU de la máquina ("host"). Si el .so se va a usar
+en otras máquinas (p.ej. la cache de GitHub Actions, cuyos runners cambian de CPU),
+hay que fijar una CPU genérica con AOT_TARGET_CPU=generic.
+"""
+
+import os
+import sys
+
+SRC_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+sys.path.insert(0, SRC_DIR)
+
+from numba.pycc import CC  # noqa: E402
+
+from committee.catalyst import _catalyst_score_kernel  # noqa: E402
+from committee.risk_reward import _rr_kernel  # noqa: E402
+from committee.seykota import _seykota_score_kernel  # noqa: E402
+from committee.turtles import _turtles_score_kernel  # noqa: E402
+
+
+def main():
+    cc = CC("_aot_kernels")
+    cc.output_dir = os.path.join(SRC_DIR, "committee")
+    cc.target_cpu = os.environ.get("AOT_TARGET_CPU", "host")
+    cc.verbose = True
+
+    # Mismas firmas que las que numba infiere al llamar a los kernels desde los wrappers
+    cc.export("turtles_score", "Tuple((i8, b1, f8, f8, f8, b1, f8))(f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)")(
+        _turtles_score_kernel.py_func
+    )
+    cc.export("seykota_score", "Tuple((i8, b1, f8, b1, b1))(f8, f8, f8, f8, f8)")(
+        _seykota_score_kernel.py_func
+    )
+    cc.export("rr_score", "Tuple((i8, f8, i8, i8, i8, f8))(f8, f8, f8, f8, f8, f8, f8)")(
+        _rr_kernel.py_func
+    )
+    cc.export("catalyst_score", "UniTuple(i8, 4)(i8, b1, f8, f8, i8)")(
+        _catalyst_score_kernel.py_func
+    )
+
+    cc.compile()
+    print(f"Kernels AOT generados en {cc.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
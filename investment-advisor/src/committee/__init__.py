@@ -14,21 +14,32 @@ Comité de SHORTS (Multi-strategy):
 - PEAD Miss (académico): Post-earnings drift negativo
 """
 
-from .regime_detector import detect_regime
+from .regime_detector import detect_regime, build_regime_context, RegimeContext
 from .turtles import evaluate_turtles
 from .seykota import evaluate_seykota, compute_weinstein_stage
 from .catalyst import evaluate_catalyst
 from .risk_reward import evaluate_risk_reward
-from .aggregator import evaluate_opportunity
+from .aggregator import evaluate_opportunity, evaluate_opportunity_batch, screen_universe
 from .short import evaluate_short_opportunity
+from .reasoning import render_reasoning
+from .results import ScoreResult, RegimeResult
+from .features import TickerFeatures
 
 __all__ = [
     "detect_regime",
+    "build_regime_context",
+    "RegimeContext",
     "evaluate_turtles",
     "evaluate_seykota",
     "compute_weinstein_stage",
     "evaluate_catalyst",
     "evaluate_risk_reward",
     "evaluate_opportunity",
-    "evaluate_short_opportunity"
+    "evaluate_opportunity_batch",
+    "screen_universe",
+    "evaluate_short_opportunity",
+    "render_reasoning",
+    "ScoreResult",
+    "RegimeResult",
+    "TickerFeatures"
 ]
@@ -0,0 +1,36 @@
+"""
+Numba opcional — JIT de los kernels numéricos del comité
+
+Si numba está instalado, @njit compila el kernel a código nativo (cache=True guarda
+la compilación en __pycache__ para no pagar el arranque en frío en cada ejecución).
+Si no lo está, njit devuelve la función intacta y prange es range: el código se
+ejecuta como Python normal con idéntico resultado.
+
+aot_kernel() da prioridad a la versión precompilada de un kernel escalar
+(scripts/build_kernels.py) para no pagar ni el JIT en frío.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Fallback sin numba: decorador identidad (soporta @njit y @njit(...))."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+
+def aot_kernel(name: str, fallback):
+    """Kernel de _aot_kernels (si se ha compilado) o, si no, fallback (@njit)."""
+    try:
+        from . import _aot_kernels
+    except ImportError:
+        return fallback
+    return getattr(_aot_kernels, name, fallback)
@@ -4,12 +4,35 @@ Aggregator - Orquestador del Comité Virtual
 Ejecuta todos los evaluadores y genera score final con reasoning completo.
 """
 
-from typing import Dict, Optional
-from .regime_detector import detect_regime, apply_sector_adjustment
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from typing import Dict, List, Optional, Tuple
+from .features import TickerFeatures
+from .results import RegimeResult, ScoreResult
+from .regime_detector import RegimeContext, build_regime_context, apply_sector_adjustment
 from .turtles import evaluate_turtles
 from .seykota import evaluate_seykota, compute_weinstein_stage
 from .catalyst import evaluate_catalyst
 from .risk_reward import evaluate_risk_reward
+from .reasoning import render_reasoning
+
+try:
+    from . import batch as _batch
+    _NUMPY_AVAILABLE = True
+except ImportError:
+    _NUMPY_AVAILABLE = False
+
+# Umbrales de decisión del comité
+BUY_THRESHOLD = 70
+WATCHLIST_THRESHOLD = 58
+
+_STAGE4_REASON = "Weinstein Stage 4 — stock en declive (precio < SMA150 declinante). Ver short scanner."
+
+# Por debajo de este número de tickers con reasoning completo, el arranque del pool
+# de procesos cuesta más de lo que ahorra: se evalúan en serie
+_MIN_ROWS_PER_WORKER = 8
 
 
 def evaluate_opportunity(
@@ -46,19 +69,40 @@ def evaluate_opportunity(
             "regime": dict,
             "breakdown": dict,
             "reasoning": dict,
-            "trade_params": dict
+            "trade_params": dict,
+            "signals": dict
         }
+
+        SKIP/REJECT devuelven solo las 4 primeras claves (ver _slim_result()).
     """
-    price = ticker_data.get("price", 0)
+    regime_ctx = build_regime_context(market_data)
+    return _evaluate_one(ticker, ticker_data, regime_ctx, catalyst_info,
+                         entry, stop, target, capital, leverage)
+
+
+def _evaluate_one(
+    ticker: str,
+    ticker_data: Dict,
+    regime_ctx: RegimeContext,
+    catalyst_info: Optional[Dict],
+    entry: Optional[float],
+    stop: Optional[float],
+    target: Optional[float],
+    capital: float,
+    leverage: int
+) -> Dict:
+    """Evalúa un ticker con el régimen ya resuelto (ver build_regime_context())."""
+    features = TickerFeatures.from_dict(ticker_data)
+    price = features.price
 
     if price <= 0:
-        return _error_result(ticker, "No hay datos de precio")
+        return _slim_result(ticker, "SKIP", "No hay datos de precio", 0)
 
     # Gate Weinstein: no comprar en Stage 4 (declive confirmado)
     # Stage 4 = precio < SMA150 declinante → es territorio de shorts, no longs
     stage = compute_weinstein_stage(ticker_data)
     if stage == 4:
-        return _skip_stage4_result(ticker, price)
+        return _slim_result(ticker, "SKIP", _STAGE4_REASON, 0)
 
     # Calcular entry, stop y target si no se proporcionan
     if entry is None:
@@ -66,8 +110,8 @@ def evaluate_opportunity(
 
     if stop is None:
         # Stop loss adaptativo basado en ATR y beta
-        atr = ticker_data.get("atr_14", 0)
-        beta = ticker_data.get("beta", 1.5)
+        atr = features.atr_14
+        beta = features.beta
 
         if atr > 0:
             # Stop = 2× ATR (típico para Turtles)
@@ -85,7 +129,7 @@ def evaluate_opportunity(
     if target is None:
         # Target adaptativo: al menos 3×riesgo para garantizar R/R mínimo
         # Para high-beta stocks el ATR es alto → stop amplio → target fijo = R/R < 3:1
-        change_pct = ticker_data.get("change_pct", 0)
+        change_pct = features.change_pct
         if change_pct and change_pct > 2:
             target_pct = 20.0  # Momentum fuerte
         else:
@@ -95,138 +139,238 @@ def evaluate_opportunity(
         target_rr3 = entry + (risk * 3)  # Mínimo R/R 3:1
         target = max(target_fixed, target_rr3)
 
-    # 1. Detectar régimen
-    regime = detect_regime(market_data)
+    # 1. Régimen (resuelto una vez por batch)
+    regime = regime_ctx.regime
 
     # 2. Evaluar cada componente
-    turtles = evaluate_turtles(ticker_data)
-    seykota = evaluate_seykota(ticker_data)
+    turtles = evaluate_turtles(features)
+    seykota = evaluate_seykota(features)
     catalyst = evaluate_catalyst(ticker_data, catalyst_info)
-    risk_reward = evaluate_risk_reward(ticker_data, entry, stop, target, capital, leverage)
+    risk_reward = evaluate_risk_reward(features, entry, stop, target, capital, leverage)
 
     # 3. Sumar scores
     raw_score = (
-        regime["score"] +
-        turtles["score"] +
-        seykota["score"] +
-        catalyst["score"] +
-        risk_reward["score"]
+        regime_ctx.score +
+        turtles.score +
+        seykota.score +
+        catalyst.score +
+        risk_reward.score
     )
 
     # 4. Ajuste por sector/régimen
-    sector = ticker_data.get("sector")
-    final_score = apply_sector_adjustment(raw_score, sector, regime)
+    final_score = apply_sector_adjustment(raw_score, features.sector, regime)
     sector_adjustment = final_score - raw_score
 
     # 5. Check hard rejects
-    hard_reject = risk_reward.get("hard_reject", False)
+    hard_reject = risk_reward.hard_reject
 
     if hard_reject:
         decision = "REJECT"
         decision_reason = "R/R < 3:1 — no cumple mínimo obligatorio"
-    elif final_score >= 70:
+    elif final_score >= BUY_THRESHOLD:
         decision = "BUY"
         decision_reason = f"Score {final_score}/100 — oportunidad de alta convicción"
-    elif final_score >= 58:
+    elif final_score >= WATCHLIST_THRESHOLD:
         decision = "WATCHLIST"
         decision_reason = f"Score {final_score}/100 — monitorear para mejor entrada"
     else:
         decision = "SKIP"
         decision_reason = f"Score {final_score}/100 — insuficiente convicción"
 
+    # Path frío: SKIP/REJECT no se reportan, no construir breakdown/reasoning/params
+    if decision in ("SKIP", "REJECT"):
+        return _slim_result(ticker, decision, decision_reason, final_score)
+
     return {
         "ticker": ticker,
         "decision": decision,
         "decision_reason": decision_reason,
         "final_score": final_score,
-        "regime": regime,
+        "regime": asdict(regime),
         "breakdown": {
-            "regime": regime["score"],
-            "turtles": turtles["score"],
-            "seykota": seykota["score"],
-            "catalyst": catalyst["score"],
-            "risk_reward": risk_reward["score"],
+            "regime": regime.score,
+            "turtles": turtles.score,
+            "seykota": seykota.score,
+            "catalyst": catalyst.score,
+            "risk_reward": risk_reward.score,
             "sector_adjustment": sector_adjustment,
             "raw_score": raw_score,
             "weinstein_stage": stage
         },
-        "reasoning": {
-            "regime": regime["reasoning"],
-            "turtles": turtles["reasoning"],
-            "seykota": seykota["reasoning"],
-            "catalyst": catalyst["reasoning"],
-            "risk_reward": risk_reward["reasoning"]
-        },
+        "reasoning": _build_reasoning(regime, turtles, seykota, catalyst, risk_reward),
         "trade_params": {
             "entry": round(entry, 2),
             "stop": round(stop, 2),
             "target": round(target, 2),
-            "rr_ratio": risk_reward["signals"]["rr_ratio"],
-            "position_eur": risk_reward["signals"]["suggested_position_eur"],
-            "stop_pct": risk_reward["signals"]["stop_pct"],
+            "rr_ratio": risk_reward.signals["rr_ratio"],
+            "position_eur": risk_reward.signals["suggested_position_eur"],
+            "stop_pct": risk_reward.signals["stop_pct"],
             "target_pct": round((target - entry) / entry * 100, 2)
         },
         "signals": {
-            "regime_type": regime["regime"],
-            "turtles": turtles["signals"],
-            "seykota": seykota["signals"],
-            "catalyst": catalyst["signals"],
-            "risk_reward": risk_reward["signals"]
+            "regime_type": regime.regime,
+            "turtles": turtles.signals,
+            "seykota": seykota.signals,
+            "catalyst": catalyst.signals,
+            "risk_reward": risk_reward.signals
         }
     }
 
 
-def _skip_stage4_result(ticker: str, price: float) -> Dict:
-    """Resultado cuando el stock está en Weinstein Stage 4 (declive confirmado)."""
+def evaluate_opportunity_batch(
+    tickers: Dict[str, Dict],
+    market_data: Dict,
+    catalysts: Optional[Dict[str, Dict]] = None,
+    capital: float = 500.0,
+    leverage: int = 5,
+    max_workers: Optional[int] = 1
+) -> Dict[str, Dict]:
+    """
+    Evalúa un universo de tickers de una vez (scoring vectorizado con NumPy).
+
+    Los scores numéricos de todos los tickers se calculan en arrays (ver batch.py).
+    El resultado completo solo se genera para los tickers que llegan a WATCHLIST o
+    BUY, que son los únicos que se reportan; el resto recibe el resultado mínimo
+    de SKIP/REJECT (ver _slim_result()).
+
+    Args:
+        tickers: {ticker: ticker_data}
+        market_data: Datos del mercado general (común a todo el batch)
+        catalysts: {ticker: catalyst_info} (opcional)
+        capital: Capital disponible
+        leverage: Apalancamiento
+        max_workers: Procesos para el reasoning completo (1 = en serie,
+            None = os.cpu_count())
+
+    Returns:
+        {ticker: resultado con el formato de evaluate_opportunity()}
+    """
+    catalysts = catalysts or {}
+
+    if not _NUMPY_AVAILABLE:
+        regime_ctx = build_regime_context(market_data)
+        jobs = [(ticker, data, catalysts.get(ticker)) for ticker, data in tickers.items()]
+        return _evaluate_details(jobs, regime_ctx, capital, leverage, max_workers)
+
+    symbols = list(tickers)
+    tickers_data = [tickers[s] for s in symbols]
+    catalyst_infos = [catalysts.get(s) for s in symbols]
+
+    regime_ctx = build_regime_context(market_data)
+    cols = _batch.score_batch(tickers_data, regime_ctx, catalyst_infos, capital, leverage,
+                              BUY_THRESHOLD, WATCHLIST_THRESHOLD)
+
+    results = {}
+    detail_jobs = []
+    for i, ticker in enumerate(symbols):
+        price = float(cols["price"][i])
+        if price <= 0:
+            results[ticker] = _slim_result(ticker, "SKIP", "No hay datos de precio", 0)
+            continue
+        if cols["stage"][i] == 4:
+            results[ticker] = _slim_result(ticker, "SKIP", _STAGE4_REASON, 0)
+            continue
+
+        final_score = int(cols["final_score"][i])
+        decision_code = cols["decision"][i]
+
+        # Path lento (reasoning completo) solo para candidatos reportables
+        if decision_code >= _batch.DECISION_WATCHLIST:
+            results[ticker] = None  # reserva la posición; se rellena abajo
+            detail_jobs.append((ticker, tickers_data[i], catalyst_infos[i]))
+            continue
+
+        if decision_code == _batch.DECISION_REJECT:
+            decision = "REJECT"
+            decision_reason = "R/R < 3:1 — no cumple mínimo obligatorio"
+        else:
+            decision = "SKIP"
+            decision_reason = f"Score {final_score}/100 — insuficiente convicción"
+
+        results[ticker] = _slim_result(ticker, decision, decision_reason, final_score)
+
+    results.update(_evaluate_details(detail_jobs, regime_ctx, capital, leverage, max_workers))
+    return results
+
+
+def screen_universe(
+    tickers: List[Tuple[str, Dict]],
+    market_data: Dict,
+    catalysts: Optional[Dict[str, Dict]] = None,
+    capital: float = 500.0,
+    leverage: int = 5,
+    max_workers: Optional[int] = None
+) -> Dict[str, Dict]:
+    """
+    Screening de un universo completo usando todos los cores.
+
+    La parte numérica va en los kernels prange de batch.py; el reasoning de los
+    candidatos reportables se reparte en un ProcessPoolExecutor.
+
+    Args:
+        tickers: [(ticker, ticker_data), ...]
+        max_workers: Procesos del pool (None = os.cpu_count())
+        (resto: ver evaluate_opportunity_batch())
+
+    Returns:
+        {ticker: resultado con el formato de evaluate_opportunity()}
+    """
+    return evaluate_opportunity_batch(dict(tickers), market_data, catalysts,
+                                      capital=capital, leverage=leverage, max_workers=max_workers)
+
+
+def _evaluate_job(job: Tuple, regime_ctx: RegimeContext, capital: float, leverage: int) -> Dict:
+    """Evalúa un (ticker, ticker_data, catalyst_info) — función de módulo para poder picklearla."""
+    ticker, ticker_data, catalyst_info = job
+    return _evaluate_one(ticker, ticker_data, regime_ctx, catalyst_info, None, None, None, capital, leverage)
+
+
+def _evaluate_details(
+    jobs: List[Tuple],
+    regime_ctx: RegimeContext,
+    capital: float,
+    leverage: int,
+    max_workers: Optional[int]
+) -> Dict[str, Dict]:
+    """Evaluación completa de cada job, en serie o en un pool de procesos si compensa."""
+    workers = max_workers or os.cpu_count() or 1
+    workers = min(workers, len(jobs) // _MIN_ROWS_PER_WORKER)
+
+    if workers <= 1:
+        return {job[0]: _evaluate_job(job, regime_ctx, capital, leverage) for job in jobs}
+
+    # spawn y no fork: score_batch ya ha arrancado el pool de hilos de numba (prange) y
+    # un hijo creado con fork hereda sus locks, lo que bloquea el intérprete al salir
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        evaluated = pool.map(
+            _evaluate_job, jobs,
+            [regime_ctx] * len(jobs), [capital] * len(jobs), [leverage] * len(jobs),
+            chunksize=max(1, len(jobs) // workers)
+        )
+        return {job[0]: result for job, result in zip(jobs, evaluated)}
+
+
+def _build_reasoning(regime: RegimeResult, turtles: ScoreResult, seykota: ScoreResult,
+                     catalyst: ScoreResult, risk_reward: ScoreResult) -> Dict:
+    """Formatea los registros diferidos de reasoning de cada evaluador (solo BUY/WATCHLIST)."""
     return {
-        "ticker": ticker,
-        "decision": "SKIP",
-        "decision_reason": "Weinstein Stage 4 — stock en declive (precio < SMA150 declinante). Ver short scanner.",
-        "final_score": 0,
-        "regime": {"regime": "stage4_blocked", "score": 0, "reasoning": "Stage 4 gate"},
-        "breakdown": {"regime": 0, "turtles": 0, "seykota": 0, "catalyst": 0, "risk_reward": 0,
-                       "sector_adjustment": 0, "raw_score": 0, "weinstein_stage": 4},
-        "reasoning": {
-            "regime": ["✗ Stage 4 Weinstein: stock en declive confirmado — no apto para long"],
-            "turtles": [], "seykota": [], "catalyst": [], "risk_reward": []
-        },
-        "trade_params": {"entry": price, "stop": 0, "target": 0, "rr_ratio": 0,
-                          "position_eur": 0, "stop_pct": 0, "target_pct": 0}
+        "regime": regime.reasoning,
+        "turtles": render_reasoning(turtles.reasoning),
+        "seykota": render_reasoning(seykota.reasoning),
+        "catalyst": render_reasoning(catalyst.reasoning),
+        "risk_reward": render_reasoning(risk_reward.reasoning)
     }
 
 
-def _error_result(ticker: str, error_msg: str) -> Dict:
-    """Retorna resultado de error cuando no se puede evaluar."""
+def _slim_result(ticker: str, decision: str, decision_reason: str, final_score: int) -> Dict:
+    """
+    Resultado mínimo para SKIP/REJECT (incluye sin datos de precio y Stage 4).
+
+    Estos tickers no se reportan: no se construyen breakdown/reasoning/trade_params.
+    """
     return {
         "ticker": ticker,
-        "decision": "SKIP",
-        "decision_reason": error_msg,
-        "final_score": 0,
-        "regime": {"regime": "unknown", "score": 0, "reasoning": error_msg},
-        "breakdown": {
-            "regime": 0,
-            "turtles": 0,
-            "seykota": 0,
-            "catalyst": 0,
-            "risk_reward": 0,
-            "sector_adjustment": 0,
-            "raw_score": 0
-        },
-        "reasoning": {
-            "regime": [error_msg],
-            "turtles": [],
-            "seykota": [],
-            "catalyst": [],
-            "risk_reward": []
-        },
-        "trade_params": {
-            "entry": 0,
-            "stop": 0,
-            "target": 0,
-            "rr_ratio": 0,
-            "position_eur": 0,
-            "stop_pct": 0,
-            "target_pct": 0
-        },
-        "signals": {}
+        "decision": decision,
+        "decision_reason": decision_reason,
+        "final_score": final_score
     }
@@ -0,0 +1,435 @@
+"""
+Batch Scoring — Comité Virtual vectorizado (struct-of-arrays)
+
+Evalúa un universo completo de tickers en una sola pasada con NumPy en vez de
+llamar a evaluate_opportunity() ticker a ticker. Cada evaluador se porta a una
+función que recibe arrays (una posición por ticker) y devuelve un array de scores;
+las ramas if/elif de los evaluadores escalares se traducen a np.where / np.select.
+Turtles, Seykota y Risk/Reward reutilizan directamente su kernel escalar (compilado con
+numba si está disponible, ver _njit.py) aplicado fila a fila con prange.
+
+Las reglas de scoring son exactamente las de turtles.py, seykota.py, catalyst.py,
+risk_reward.py y regime_detector.py: cualquier cambio allí debe reflejarse aquí.
+
+Requiere numpy (opcional: aggregator.py cae al path escalar si no está instalado).
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ._njit import njit, prange
+from .catalyst import (
+    _EXPECTATIONS_ID, _EXPECTATIONS_UNKNOWN, _catalyst_score_kernel, _resolve_catalyst_type
+)
+from .regime_detector import _SECTOR_BOOST_PTS, _SECTOR_PENALTY_PTS, RegimeContext, _bias_pattern
+from .risk_reward import _rr_kernel
+from .seykota import _seykota_score_kernel
+from .turtles import _turtles_score_kernel
+
+
+# Tipos de las columnas de score: componentes 0-25 caben en int8, las sumas en int16.
+# Precios y ratios se quedan en float64: entry/stop/target se redondean a céntimos y
+# con float32 (7 dígitos) el redondeo dejaría de coincidir con el path escalar.
+SCORE_DTYPE = np.int8
+TOTAL_DTYPE = np.int16
+
+# Códigos de decisión de _finalize()
+DECISION_REJECT = 0
+DECISION_SKIP = 1
+DECISION_WATCHLIST = 2
+DECISION_BUY = 3
+
+# Campos numéricos del SoA y su default (mismo default que el .get() del evaluador escalar).
+# None = el default depende de otro campo (se resuelve en build_soa).
+_FIELDS = {
+    "price": 0.0,
+    "atr_14": 0.0,
+    "beta": 1.5,
+    "change_pct": 0.0,
+    "high_20d": 0.0,             # 0 = sin histórico (turtles puntúa 0)
+    "avg_volume_20d": 1.0,
+    "volume": 0.0,
+    "52w_high": 0.0,
+    "52w_low": 0.0,
+    "price_60d_ago": None,       # default: price
+    "spy_price_60d_ago": 0.0,
+    "spy_price": 0.0,
+    "ema_20": 0.0,
+    "ema_50": 0.0,
+    "ema_200": 0.0,
+    "price_10d_ago": None,       # default: price
+    "sma_150": 0.0,
+    "sma_150_20d_ago": None,     # default: sma_150
+    "historical_earnings_reaction": 0.0,
+    "eps_surprise_pct": np.nan,  # NaN = sin dato
+    "days_since_earnings": np.nan,
+    "short_pct": np.nan,
+    "short_ratio": 0.0,
+    "insider_buys_30d": 0.0,
+    "insider_unique_buyers_30d": 0.0,
+    "insider_sells_30d": 0.0,
+    "edgar_insider_buys_30d": 0.0,
+    "edgar_unique_buyers_30d": 0.0,
+    "news_sentiment_score": np.nan,
+    "news_articles_week": 0.0,
+}
+
+_DEPENDENT_DEFAULTS = {
+    "price_60d_ago": "price",
+    "price_10d_ago": "price",
+    "sma_150_20d_ago": "sma_150",
+}
+
+# Campos donde un None explícito equivale a "sin dato" (NaN) y no al default
+_NULLABLE = {"eps_surprise_pct", "days_since_earnings", "short_pct", "news_sentiment_score"}
+
+# Campos donde el evaluador escalar hace `x or 0`
+_FALSY_AS_ZERO = {
+    "short_ratio", "insider_buys_30d", "insider_unique_buyers_30d", "insider_sells_30d",
+    "edgar_insider_buys_30d", "edgar_unique_buyers_30d", "news_articles_week",
+}
+
+
+def build_soa(tickers_data: Sequence[Dict]) -> Dict[str, np.ndarray]:
+    """
+    Convierte una lista de ticker_data (dicts) a struct-of-arrays float64.
+
+    Un campo ausente toma el mismo default que usa el evaluador escalar.
+    """
+    n = len(tickers_data)
+    soa = {}
+
+    for field, default in _FIELDS.items():
+        column = np.empty(n, dtype=np.float64)
+        for i, data in enumerate(tickers_data):
+            value = data.get(field)
+            if value is None:
+                if field in _FALSY_AS_ZERO:
+                    value = 0.0
+                elif field in _NULLABLE or field in _DEPENDENT_DEFAULTS:
+                    value = np.nan
+                else:
+                    value = default
+            column[i] = value
+        soa[field] = column
+
+    for field, source in _DEPENDENT_DEFAULTS.items():
+        column = soa[field]
+        missing = np.isnan(column)
+        column[missing] = soa[source][missing]
+
+    soa["edgar_insider_cluster_buy"] = np.array(
+        [bool(d.get("edgar_insider_cluster_buy", False)) for d in tickers_data], dtype=bool
+    )
+    return soa
+
+
+# ============================================================================
+# EVALUADORES VECTORIZADOS
+# ============================================================================
+
+def weinstein_stage_batch(price: np.ndarray, sma_150: np.ndarray, sma_150_20d_ago: np.ndarray) -> np.ndarray:
+    """Versión vectorizada de compute_weinstein_stage()."""
+    sma_rising = np.where(sma_150_20d_ago > 0, sma_150 > sma_150_20d_ago * 1.001, True)
+    stage = np.where(
+        price > sma_150,
+        np.where(sma_rising, 2, 3),
+        np.where(sma_rising, 1, 4)
+    )
+    return np.where((price <= 0) | (sma_150 <= 0), 0, stage).astype(SCORE_DTYPE)
+
+
+def trade_levels_batch(soa: Dict[str, np.ndarray]):
+    """Entry/stop/target por defecto (mismas reglas que evaluate_opportunity), para el scoring R/R."""
+    price = soa["price"]
+    atr = soa["atr_14"]
+    beta = soa["beta"]
+
+    entry = price * 0.995
+    stop_pct = np.select([beta >= 2.0, beta >= 1.5], [10.0, 8.0], 6.0)
+    stop = np.where(atr > 0, price - atr * 2, price * (1 - stop_pct / 100))
+
+    target_pct = np.where(soa["change_pct"] > 2, 20.0, 15.0)
+    target_fixed = price * (1 + target_pct / 100)
+    target_rr3 = entry + (entry - stop) * 3
+    target = np.maximum(target_fixed, target_rr3)
+    return entry, stop, target
+
+
+@njit(parallel=True, cache=True)
+def _turtles_score_batch(prices, highs_20d, avg_volumes, volumes, atrs, highs_52w, lows_52w,
+                         prices_60d_ago, spy_prices_60d_ago, spy_prices):
+    """Aplica _turtles_score_kernel a todo el batch (prange reparte las filas entre cores)."""
+    n = prices.shape[0]
+    scores = np.empty(n, dtype=SCORE_DTYPE)
+    for i in prange(n):
+        scores[i] = _turtles_score_kernel(
+            prices[i], highs_20d[i], avg_volumes[i], volumes[i], atrs[i], highs_52w[i], lows_52w[i],
+            prices_60d_ago[i], spy_prices_60d_ago[i], spy_prices[i]
+        )[0]
+    return scores
+
+
+def score_turtles_batch(soa: Dict[str, np.ndarray]) -> np.ndarray:
+    """Score de evaluate_turtles() para todo el batch (0-25)."""
+    return _turtles_score_batch(
+        soa["price"], soa["high_20d"], soa["avg_volume_20d"], soa["volume"], soa["atr_14"],
+        soa["52w_high"], soa["52w_low"], soa["price_60d_ago"], soa["spy_price_60d_ago"], soa["spy_price"]
+    )
+
+
+@njit(parallel=True, cache=True)
+def _seykota_score_batch(prices, ema20s, ema50s, ema200s, prices_10d_ago):
+    """Aplica _seykota_score_kernel a todo el batch (prange reparte las filas entre cores)."""
+    n = prices.shape[0]
+    scores = np.empty(n, dtype=SCORE_DTYPE)
+    for i in prange(n):
+        scores[i] = _seykota_score_kernel(prices[i], ema20s[i], ema50s[i], ema200s[i], prices_10d_ago[i])[0]
+    return scores
+
+
+def score_seykota_batch(soa: Dict[str, np.ndarray]) -> np.ndarray:
+    """Score de evaluate_seykota() para todo el batch (0-20)."""
+    return _seykota_score_batch(
+        soa["price"], soa["ema_20"], soa["ema_50"], soa["ema_200"], soa["price_10d_ago"]
+    )
+
+
+def score_extra_signals_batch(soa: Dict[str, np.ndarray]) -> np.ndarray:
+    """Versión vectorizada del score de _check_extra_signals() (catalyst.py)."""
+    # 1. PEAD Long
+    eps = soa["eps_surprise_pct"]
+    days_since = soa["days_since_earnings"]
+    pead = (eps > 10) & ~np.isnan(days_since)
+    score = np.where(pead, np.select([days_since <= 5, days_since <= 15], [4, 2], 0), 0)
+
+    # 2. Short squeeze
+    short_pct = soa["short_pct"]
+    squeeze = np.select([soa["short_ratio"] >= 3, short_pct > 0.20], [3, 2], 0)
+    score += np.where(short_pct > 0.15, squeeze, 0)
+
+    # 3. Insider buying
+    total_buys = np.maximum(soa["insider_buys_30d"], soa["edgar_insider_buys_30d"])
+    total_unique = np.maximum(soa["insider_unique_buyers_30d"], soa["edgar_unique_buyers_30d"])
+    net_positive = total_buys > soa["insider_sells_30d"]
+    score += np.select(
+        [
+            (soa["edgar_insider_cluster_buy"] | (total_unique >= 3)) & net_positive,
+            (total_buys >= 2) & net_positive,
+            (total_buys == 1) & net_positive,
+        ],
+        [4, 2, 1],
+        0
+    )
+
+    # 4. News sentiment
+    news = soa["news_sentiment_score"]
+    has_news = ~np.isnan(news) & (soa["news_articles_week"] >= 3)
+    score += np.where(has_news, np.select([news > 0.3, news < -0.3], [1, -1], 0), 0)
+
+    return score
+
+
+def _catalyst_columns(catalyst_infos: Sequence[Optional[Dict]]):
+    """Extrae tipo/días/expectativas de cada catalyst_info (strings → códigos enteros)."""
+    n = len(catalyst_infos)
+    has_catalyst = np.zeros(n, dtype=bool)
+    type_id = np.full(n, -1, dtype=np.int64)
+    exact_type = np.zeros(n, dtype=bool)
+    days = np.full(n, 999.0)
+    expectations_id = np.full(n, _EXPECTATIONS_UNKNOWN, dtype=np.int8)
+
+    for i, info in enumerate(catalyst_infos):
+        if not info:
+            continue
+        has_catalyst[i] = True
+        type_id[i], exact_type[i] = _resolve_catalyst_type(info.get("type", "unknown").lower())
+        days[i] = info.get("days_ahead") or info.get("days_to_event", 999)
+        expectations = info.get("consensus_sentiment", "neutral").lower()
+        expectations_id[i] = _EXPECTATIONS_ID.get(expectations, _EXPECTATIONS_UNKNOWN)
+
+    return has_catalyst, type_id, exact_type, days, expectations_id
+
+
+@njit(parallel=True, cache=True)
+def _catalyst_score_batch(type_ids, exact_types, days, reactions, expectations_ids):
+    """Aplica _catalyst_score_kernel fila a fila (paralelo con numba)."""
+    n = type_ids.shape[0]
+    out = np.empty(n, dtype=SCORE_DTYPE)
+    for i in prange(n):
+        type_points, timing_points, reaction_points, expectations_points = _catalyst_score_kernel(
+            type_ids[i], exact_types[i], days[i], reactions[i], expectations_ids[i]
+        )
+        out[i] = type_points + timing_points + reaction_points + expectations_points
+    return out
+
+
+def score_catalyst_batch(soa: Dict[str, np.ndarray], catalyst_infos: Sequence[Optional[Dict]]) -> np.ndarray:
+    """Versión vectorizada del score de evaluate_catalyst() (0-25)."""
+    has_catalyst, type_id, exact_type, days, expectations_id = _catalyst_columns(catalyst_infos)
+    extra = score_extra_signals_batch(soa)
+
+    with_catalyst = _catalyst_score_batch(type_id, exact_type, days, soa["historical_earnings_reaction"],
+                                          expectations_id)
+    score = np.where(has_catalyst, with_catalyst, 14) + extra
+    return np.minimum(score, 25).astype(SCORE_DTYPE)
+
+
+@njit(parallel=True, cache=True)
+def _rr_batch(entry, stop, target, atr, price, capital, leverage):
+    """Aplica _rr_kernel a todo el batch."""
+    n = entry.shape[0]
+    status = np.empty(n, dtype=np.int8)
+    rr_ratio = np.empty(n, dtype=np.float64)
+    score = np.empty(n, dtype=SCORE_DTYPE)
+    position_value = np.empty(n, dtype=np.float64)
+    for i in prange(n):
+        st, rr, rr_points, stop_points, sizing_points, pos = _rr_kernel(
+            entry[i], stop[i], target[i], atr[i], price[i], capital, leverage
+        )
+        status[i] = st
+        rr_ratio[i] = rr
+        score[i] = rr_points + stop_points + sizing_points
+        position_value[i] = pos
+    return status, rr_ratio, score, position_value
+
+
+def risk_reward_batch(
+    soa: Dict[str, np.ndarray],
+    entry: np.ndarray,
+    stop: np.ndarray,
+    target: np.ndarray,
+    capital: float = 500.0,
+    leverage: int = 5
+) -> Dict[str, np.ndarray]:
+    """
+    Versión batch de evaluate_risk_reward() (mismo kernel, aplicado con prange).
+
+    Solo devuelve lo que necesita la decisión: el trade_params de los tickers
+    reportables lo construye _evaluate_one() con sus mismos niveles escalares.
+
+    Returns:
+        {"score", "hard_reject", "rr_ratio"} como arrays
+    """
+    status, rr_ratio, score, _ = _rr_batch(
+        entry, stop, target, soa["atr_14"], soa["price"], float(capital), float(leverage)
+    )
+
+    return {
+        "score": score,
+        "hard_reject": (status != 0) | (rr_ratio < 3.0),
+        "rr_ratio": rr_ratio,
+    }
+
+
+def sector_adjustment_batch(sectors: Sequence[Optional[str]], regime_ctx: RegimeContext) -> np.ndarray:
+    """
+    Ajuste sectorial por fila (+5 boost, -10 penalización, 0 ninguno) como int8.
+
+    El régimen es común a todo el batch, así que cada sector distinto se resuelve
+    una sola vez con los patrones de apply_sector_adjustment().
+    """
+    boost_re = _bias_pattern(tuple(regime_ctx.boost))
+    penalize_re = _bias_pattern(tuple(regime_ctx.penalize))
+
+    adjustment = np.zeros(len(sectors), dtype=np.int8)
+    if boost_re is None and penalize_re is None:
+        return adjustment
+
+    by_sector = {}
+    for i, sector in enumerate(sectors):
+        if not sector:
+            continue
+        adj = by_sector.get(sector)
+        if adj is None:
+            sector_lower = sector.lower()
+            if boost_re is not None and boost_re.search(sector_lower):
+                adj = _SECTOR_BOOST_PTS
+            elif penalize_re is not None and penalize_re.search(sector_lower):
+                adj = _SECTOR_PENALTY_PTS
+            else:
+                adj = 0
+            by_sector[sector] = adj
+        adjustment[i] = adj
+    return adjustment
+
+
+@njit(parallel=True, cache=True)
+def _finalize(regime_score, turtles, seykota, catalyst, risk_reward, sector_adj, hard_reject,
+              buy_threshold, watchlist_threshold):
+    """
+    Suma de componentes + ajuste sectorial + decisión en una sola pasada por fila.
+
+    Returns:
+        (raw_score, final_score, decision_code) como arrays
+    """
+    n = turtles.shape[0]
+    raw_score = np.empty(n, dtype=TOTAL_DTYPE)
+    final_score = np.empty(n, dtype=TOTAL_DTYPE)
+    decision = np.empty(n, dtype=np.int8)
+    base = np.int64(regime_score)  # acumular en 64 bits aunque las columnas sean int8
+    for i in prange(n):
+        raw = base + turtles[i] + seykota[i] + catalyst[i] + risk_reward[i]
+        # Clip sin ramas: min/max se vectorizan (raw ya está en 0-100)
+        final = min(max(raw + sector_adj[i], 0), 100)
+
+        raw_score[i] = raw
+        final_score[i] = final
+        if hard_reject[i]:
+            decision[i] = DECISION_REJECT
+        elif final >= buy_threshold:
+            decision[i] = DECISION_BUY
+        elif final >= watchlist_threshold:
+            decision[i] = DECISION_WATCHLIST
+        else:
+            decision[i] = DECISION_SKIP
+    return raw_score, final_score, decision
+
+
+def score_batch(
+    tickers_data: List[Dict],
+    regime_ctx: RegimeContext,
+    catalyst_infos: Sequence[Optional[Dict]],
+    capital: float,
+    leverage: int,
+    buy_threshold: int,
+    watchlist_threshold: int
+) -> Dict[str, np.ndarray]:
+    """
+    Ejecuta todo el comité sobre el batch y devuelve las columnas de resultado.
+
+    "decision" es un código DECISION_* por fila (umbrales del aggregator). Las filas
+    con price <= 0 o Weinstein Stage 4 se devuelven con score 0; el llamador decide
+    cómo reportarlas (ver evaluate_opportunity_batch()).
+    """
+    soa = build_soa(tickers_data)
+    price = soa["price"]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stage = weinstein_stage_batch(price, soa["sma_150"], soa["sma_150_20d_ago"])
+        entry, stop, target = trade_levels_batch(soa)
+
+        turtles = score_turtles_batch(soa)
+        seykota = score_seykota_batch(soa)
+        catalyst = score_catalyst_batch(soa, catalyst_infos)
+        rr = risk_reward_batch(soa, entry, stop, target, capital, leverage)
+
+        sector_adj = sector_adjustment_batch([d.get("sector") for d in tickers_data], regime_ctx)
+        raw_score, final_score, decision = _finalize(
+            regime_ctx.score, turtles, seykota, catalyst, rr["score"], sector_adj, rr["hard_reject"],
+            buy_threshold, watchlist_threshold
+        )
+
+    return {
+        "price": price,
+        "stage": stage,
+        "turtles": turtles,
+        "seykota": seykota,
+        "catalyst": catalyst,
+        "risk_reward": rr["score"],
+        "hard_reject": rr["hard_reject"],
+        "raw_score": raw_score,
+        "final_score": final_score,
+        "decision": decision,
+    }
@@ -0,0 +1,162 @@
+"""
+Cache en disco de evaluaciones del comité
+
+En screenings intradía repetidos, muchos tickers llegan con exactamente los mismos
+datos que en la ejecución anterior. El resultado se guarda en disco (un pickle por
+clave) con TTL, indexado por sha256 de los argumentos de la llamada.
+
+Cada entrada es un fichero independiente escrito de forma atómica (os.replace):
+varios procesos pueden leer y escribir a la vez sin locks. El mtime de cada
+fichero es su fecha de caducidad, así que prune() limpia el directorio sin abrir
+los pickles.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+from typing import Any, Callable, Optional, Tuple
+
+
+def _public(obj: Any) -> Any:
+    """Copia de obj sin las claves privadas (prefijo "_") de sus dicts, a cualquier nivel."""
+    if isinstance(obj, dict):
+        return {k: _public(v) for k, v in obj.items() if not (isinstance(k, str) and k.startswith("_"))}
+    if isinstance(obj, (list, tuple)):
+        return [_public(v) for v in obj]
+    return obj
+
+
+def fingerprint(*parts: Any) -> str:
+    """
+    sha256 estable de estructuras JSON-serializables (dicts ordenados por clave).
+
+    Las claves privadas (p.ej. "_closes_raw", el histórico de cierres del quote) no
+    forman parte de la huella: ya están reflejadas en los indicadores derivados y
+    serializarlas en cada llamada costaba más que el propio hash.
+    """
+    payload = json.dumps(_public(parts), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class DiskCache:
+    """Cache clave → valor en un directorio, con caducidad por entrada y contadores."""
+
+    # Un .tmp más antiguo que esto es de una escritura que no llegó al os.replace
+    TMP_MAX_AGE = 3600
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Retorna (hit, valor). Entradas caducadas o ilegibles cuentan como miss."""
+        try:
+            with open(self._path(key), "rb") as f:
+                expires_at, value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            self.misses += 1
+            return False, None
+
+        if expires_at < time.time():
+            self.misses += 1
+            self._remove(self._path(key))
+            return False, None
+
+        self.hits += 1
+        return True, value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Guarda value durante ttl segundos (escritura atómica)."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            expires_at = time.time() + ttl
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((expires_at, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.utime(tmp_path, (expires_at, expires_at))
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            # Un cache que no se puede escribir no debe romper el scan
+            print(f"Cache no disponible ({self.directory}): {e}")
+
+    def prune(self) -> int:
+        """
+        Borra las entradas caducadas y los .tmp huérfanos (escrituras interrumpidas).
+
+        Las claves que dependen de los datos del ticker cambian en cada scan y nunca
+        se vuelven a leer, así que get() no basta para que el directorio no crezca.
+        Retorna el número de ficheros borrados.
+        """
+        now = time.time()
+        removed = 0
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return 0
+
+        for entry in entries:
+            try:
+                mtime = entry.stat().st_mtime
+            except OSError:
+                continue
+            if entry.name.endswith(".pkl"):
+                stale = mtime < now
+            else:
+                stale = entry.name.endswith(".tmp") and mtime < now - self.TMP_MAX_AGE
+            if stale and self._remove(entry.path):
+                removed += 1
+        return removed
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def stats(self) -> dict:
+        """Contadores de hit/miss desde la creación del cache."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
+
+
+def cached(ttl: float, backend: DiskCache, key_func: Optional[Callable[..., str]] = None):
+    """
+    Decorador: memoiza la función en backend durante ttl segundos.
+
+    Por defecto la clave es fingerprint(nombre de la función, args, kwargs). El valor
+    devuelto se deserializa en cada hit, así que el llamador puede mutarlo sin
+    afectar al cache.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if key_func is not None:
+                key = key_func(*args, **kwargs)
+            else:
+                key = fingerprint(func.__qualname__, args, kwargs)
+
+            hit, value = backend.get(key)
+            if hit:
+                return value
+
+            value = func(*args, **kwargs)
+            backend.set(key, value, ttl)
+            return value
+
+        wrapper.cache = backend
+        return wrapper
+    return decorator
@@ -10,8 +10,12 @@ Puntuación: 0-25 puntos distribuidos en:
 - Asimetría de expectativas: 5 pts
 """
 
+from functools import lru_cache
 from typing import Dict, Optional
 
+from ._njit import aot_kernel, njit
+from .results import ScoreResult
+
 
 # Puntuaciones por tipo de catalizador
 CATALYST_SCORES = {
@@ -36,7 +40,95 @@ CATALYST_SCORES = {
 }
 
 
-def evaluate_catalyst(ticker_data: Dict, catalyst_info: Optional[Dict]) -> Dict:
+# Código entero de cada tipo (índice en _CAT_TYPE_POINTS); -1 = tipo no reconocido
+_CATALYST_TYPE_ID = {key: i for i, key in enumerate(CATALYST_SCORES)}
+_CAT_TYPE_POINTS = tuple(CATALYST_SCORES.values())
+# Para el matching por substring: claves más largas primero ("fda_approval" antes que "fda")
+_CATALYST_PATTERNS = tuple(sorted(_CATALYST_TYPE_ID.items(), key=lambda kv: -len(kv[0])))
+_UNKNOWN_TYPE_POINTS = 2
+
+# Tipos con bonus de asimetría si las expectativas son bajas (bitmask sobre type_id)
+_ASYMMETRY_TYPES_MASK = 0
+for _key in ("earnings", "fda_decision", "fda", "product_launch"):
+    _ASYMMETRY_TYPES_MASK |= 1 << _CATALYST_TYPE_ID[_key]
+
+# Códigos de consensus_sentiment; cualquier otro valor = desconocido
+_EXPECTATIONS_ID = {"low": 0, "neutral": 1, "high": 2}
+_EXPECTATIONS_UNKNOWN = 3
+
+
+@lru_cache(maxsize=512)
+def _resolve_catalyst_type(catalyst_type: str):
+    """
+    Resuelve catalyst_type (ya en lowercase) a (type_id, exact).
+
+    Coincidencia exacta primero (caso habitual: "earnings"); si no, la clave más
+    larga de CATALYST_SCORES contenida en el string. (-1, False) si no hay match.
+    """
+    type_id = _CATALYST_TYPE_ID.get(catalyst_type)
+    if type_id is not None:
+        return type_id, True
+
+    for key, type_id in _CATALYST_PATTERNS:
+        if key in catalyst_type:
+            return type_id, False
+    return -1, False
+
+
+@njit(cache=True)
+def _catalyst_score_kernel(type_id, exact_type, days_to_event, historical_reaction, expectations_id):
+    """
+    Kernel numérico de evaluate_catalyst con catalizador (compilable con numba).
+
+    Returns:
+        (type_points, timing_points, reaction_points, expectations_points)
+    """
+    # 1. Tipo de catalizador (8 puntos máximo)
+    if type_id >= 0:
+        type_points = _CAT_TYPE_POINTS[type_id]
+    else:
+        type_points = _UNKNOWN_TYPE_POINTS
+
+    # 2. Proximidad temporal (7 puntos máximo). Sweet spot: 3-7 días
+    if 3 <= days_to_event <= 7:
+        timing_points = 7
+    elif 1 <= days_to_event <= 14:
+        timing_points = 4
+    elif days_to_event > 14 and days_to_event < 30:
+        timing_points = 2
+    elif days_to_event >= 30:
+        timing_points = 1
+    else:
+        timing_points = 2  # Inminente (< 1 día) o ya pasó
+
+    # 3. Historial de reacción (5 puntos máximo); sin dato = neutral
+    if historical_reaction >= 10:
+        reaction_points = 5
+    elif historical_reaction >= 5:
+        reaction_points = 3
+    elif historical_reaction > 0:
+        reaction_points = 1
+    else:
+        reaction_points = 2
+
+    # 4. Asimetría de expectativas (5 puntos máximo); solo el tipo exacto cuenta
+    asymmetric = exact_type and type_id >= 0 and (_ASYMMETRY_TYPES_MASK >> type_id) & 1
+    if expectations_id == 0 and asymmetric:
+        expectations_points = 5
+    elif expectations_id == 2:
+        expectations_points = 1
+    else:
+        expectations_points = 3  # Neutral o desconocido
+
+    return type_points, timing_points, reaction_points, expectations_points
+
+
+# Llamadas escalares: kernel precompilado si existe (ver scripts/build_kernels.py).
+# batch.py sigue usando la versión @njit, que es la que se puede llamar desde prange.
+_catalyst_score = aot_kernel("catalyst_score", _catalyst_score_kernel)
+
+
+def evaluate_catalyst(ticker_data: Dict, catalyst_info: Optional[Dict]) -> ScoreResult:
     """
     Evalúa calidad y timing del catalizador.
 
@@ -52,15 +144,8 @@ def evaluate_catalyst(ticker_data: Dict, catalyst_info: Optional[Dict]) -> Dict:
         }
 
     Returns:
-        {
-            "style": "catalyst",
-            "score": int (0-25),
-            "max_score": 25,
-            "reasoning": list[str],
-            "signals": dict
-        }
+        ScoreResult(style="catalyst", score 0-25, max_score=25)
     """
-    score = 0
     reasoning = []
 
     # Verificar señales adicionales independientes del catalizador
@@ -69,102 +154,83 @@ def evaluate_catalyst(ticker_data: Dict, catalyst_info: Optional[Dict]) -> Dict:
     # Si no hay catalizador, usar score neutro + señales extra
     if not catalyst_info:
         base_score = 14 + extra_signals["score"]
-        return {
-            "style": "catalyst",
-            "score": min(base_score, 25),
-            "max_score": 25,
-            "reasoning": ["~ Sin catalizador identificado — scoring técnico puro"] + extra_signals["reasoning"],
-            "signals": {
+        return ScoreResult(
+            style="catalyst",
+            score=min(base_score, 25),
+            max_score=25,
+            reasoning=["~ Sin catalizador identificado — scoring técnico puro"] + extra_signals["reasoning"],
+            signals={
                 "catalyst_type": "none",
                 "days_to_event": 999,
                 "historical_avg_move": 0,
                 **extra_signals["signals"]
             }
-        }
+        )
 
     catalyst_type = catalyst_info.get("type", "unknown").lower()
     days_to_event = catalyst_info.get("days_ahead") or catalyst_info.get("days_to_event", 999)
     expectations = catalyst_info.get("consensus_sentiment", "neutral").lower()
     historical_reaction = ticker_data.get("historical_earnings_reaction", 0)
 
-    # 1. Tipo de catalizador (8 puntos máximo)
-    cat_score = 2  # Default para tipos desconocidos
+    type_id, exact_type = _resolve_catalyst_type(catalyst_type)
+    cat_score, timing_points, reaction_points, expectations_points = _catalyst_score(
+        type_id, exact_type, float(days_to_event), float(historical_reaction),
+        _EXPECTATIONS_ID.get(expectations, _EXPECTATIONS_UNKNOWN)
+    )
+    score = cat_score + timing_points + reaction_points + expectations_points
 
-    for key, value in CATALYST_SCORES.items():
-        if key in catalyst_type:
-            cat_score = value
-            break
-
-    score += cat_score
+    # 1. Tipo de catalizador
     emoji = "✓" if cat_score >= 6 else "~"
-    reasoning.append(f"{emoji} Catalizador: {catalyst_type} ({cat_score}/8 pts)")
-
-    # 2. Proximidad temporal (7 puntos máximo)
-    # Sweet spot: 3-10 días
-    if 3 <= days_to_event <= 7:
-        score += 7
-        reasoning.append(f"✓ Timing óptimo: {days_to_event} días hasta evento")
-    elif 1 <= days_to_event <= 14:
-        score += 4
-        reasoning.append(f"~ Timing aceptable: {days_to_event} días hasta evento")
-    elif days_to_event > 14 and days_to_event < 30:
-        score += 2
-        reasoning.append(f"~ Evento algo lejano: {days_to_event} días (capital inmovilizado)")
-    elif days_to_event >= 30:
-        score += 1
-        reasoning.append(f"✗ Evento muy lejano: {days_to_event} días")
+    reasoning.append(("{} Catalizador: {} ({}/8 pts)", emoji, catalyst_type, cat_score))
+
+    # 2. Proximidad temporal
+    if timing_points == 7:
+        reasoning.append(("✓ Timing óptimo: {} días hasta evento", days_to_event))
+    elif timing_points == 4:
+        reasoning.append(("~ Timing aceptable: {} días hasta evento", days_to_event))
+    elif timing_points == 1:
+        reasoning.append(("✗ Evento muy lejano: {} días", days_to_event))
+    elif days_to_event > 14:
+        reasoning.append(("~ Evento algo lejano: {} días (capital inmovilizado)", days_to_event))
     else:
-        # Evento inminente (< 1 día) o ya pasó
-        score += 2
-        reasoning.append(f"~ Evento inminente o pasado ({days_to_event} días)")
-
-    # 3. Historial de reacción (5 puntos máximo)
-    # Si no hay dato histórico, dar puntos neutros
-    if historical_reaction >= 10:
-        score += 5
-        reasoning.append(f"✓ Historial: ticker mueve ~{historical_reaction:.0f}% en eventos similares")
-    elif historical_reaction >= 5:
-        score += 3
-        reasoning.append(f"~ Historial: ticker mueve ~{historical_reaction:.0f}% en eventos similares")
-    elif historical_reaction > 0:
-        score += 1
-        reasoning.append(f"✗ Historial de baja reactividad ({historical_reaction:.0f}%)")
+        reasoning.append(("~ Evento inminente o pasado ({} días)", days_to_event))
+
+    # 3. Historial de reacción
+    if reaction_points == 5:
+        reasoning.append(("✓ Historial: ticker mueve ~{:.0f}% en eventos similares", historical_reaction))
+    elif reaction_points == 3:
+        reasoning.append(("~ Historial: ticker mueve ~{:.0f}% en eventos similares", historical_reaction))
+    elif reaction_points == 1:
+        reasoning.append(("✗ Historial de baja reactividad ({:.0f}%)", historical_reaction))
     else:
-        # Sin dato histórico - asumir neutral
-        score += 2
-        reasoning.append(f"~ Sin datos históricos de reacción a eventos")
+        reasoning.append("~ Sin datos históricos de reacción a eventos")
 
-    # 4. Asimetría de expectativas (5 puntos máximo)
-    if expectations == "low" and catalyst_type in ["earnings", "fda_decision", "fda", "product_launch"]:
-        score += 5
-        reasoning.append(f"✓ Expectativas bajas → potencial sorpresa positiva")
+    # 4. Asimetría de expectativas
+    if expectations_points == 5:
+        reasoning.append("✓ Expectativas bajas → potencial sorpresa positiva")
     elif expectations == "neutral":
-        score += 3
-        reasoning.append(f"~ Expectativas neutrales")
+        reasoning.append("~ Expectativas neutrales")
     elif expectations == "high":
-        score += 1
-        reasoning.append(f"✗ Expectativas altas → upside limitado, downside si decepciona")
+        reasoning.append("✗ Expectativas altas → upside limitado, downside si decepciona")
     else:
-        # Sin dato de expectations, asumir neutral
-        score += 3
-        reasoning.append(f"~ Expectativas desconocidas (asumiendo neutral)")
+        reasoning.append("~ Expectativas desconocidas (asumiendo neutral)")
 
     score += extra_signals["score"]
     reasoning += extra_signals["reasoning"]
 
-    return {
-        "style": "catalyst",
-        "score": min(score, 25),
-        "max_score": 25,
-        "reasoning": reasoning,
-        "signals": {
+    return ScoreResult(
+        style="catalyst",
+        score=min(score, 25),
+        max_score=25,
+        reasoning=reasoning,
+        signals={
             "catalyst_type": catalyst_type,
             "days_to_event": days_to_event,
             "historical_avg_move": historical_reaction,
             "expectations": expectations,
             **extra_signals["signals"]
         }
-    }
+    )
 
 
 def _check_extra_signals(ticker_data: dict) -> dict:
@@ -188,10 +254,10 @@ def _check_extra_signals(ticker_data: dict) -> dict:
     if eps_surprise_pct is not None and eps_surprise_pct > 10 and days_since_earnings is not None:
         if days_since_earnings <= 5:
             score += 4
-            reasoning.append(f"✓✓ PEAD Long: EPS beat +{eps_surprise_pct:.1f}% hace {days_since_earnings}d (drift alcista activo)")
+            reasoning.append(("✓✓ PEAD Long: EPS beat +{:.1f}% hace {}d (drift alcista activo)", eps_surprise_pct, days_since_earnings))
         elif days_since_earnings <= 15:
             score += 2
-            reasoning.append(f"✓ PEAD Long: EPS beat +{eps_surprise_pct:.1f}% hace {days_since_earnings}d")
+            reasoning.append(("✓ PEAD Long: EPS beat +{:.1f}% hace {}d", eps_surprise_pct, days_since_earnings))
         signals["pead_long_active"] = True
         signals["eps_beat_pct"] = eps_surprise_pct
     else:
@@ -205,10 +271,10 @@ def _check_extra_signals(ticker_data: dict) -> dict:
         days_to_cover = short_ratio or 0
         if days_to_cover >= 3:
             score += 3
-            reasoning.append(f"✓✓ Short Squeeze setup: {short_pct*100:.0f}% float short, {days_to_cover:.1f}d to cover")
+            reasoning.append(("✓✓ Short Squeeze setup: {:.0f}% float short, {:.1f}d to cover", short_pct*100, days_to_cover))
         elif short_pct > 0.20:
             score += 2
-            reasoning.append(f"✓ Alto short interest: {short_pct*100:.0f}% del float — potencial squeeze")
+            reasoning.append(("✓ Alto short interest: {:.0f}% del float — potencial squeeze", short_pct*100))
         signals["squeeze_potential"] = True
         signals["short_float_pct"] = short_pct
     else:
@@ -230,15 +296,15 @@ def _check_extra_signals(ticker_data: dict) -> dict:
     if (edgar_cluster or total_unique >= 3) and net_positive:
         score += 4
         source = "EDGAR Form 4 + Finnhub" if edgar_cluster else "Finnhub"
-        reasoning.append(f"✓✓ CLUSTER BUY insider: {total_unique} insiders compraron en 30d ({source})")
+        reasoning.append(("✓✓ CLUSTER BUY insider: {} insiders compraron en 30d ({})", total_unique, source))
         signals["insider_cluster_buy"] = True
     elif total_buys >= 2 and net_positive:
         score += 2
-        reasoning.append(f"✓ Insider buying: {total_buys} compras en 30d (Finnhub)")
+        reasoning.append(("✓ Insider buying: {} compras en 30d (Finnhub)", total_buys))
         signals["insider_cluster_buy"] = False
     elif total_buys == 1 and net_positive:
         score += 1
-        reasoning.append(f"~ Insider buy individual en 30d")
+        reasoning.append("~ Insider buy individual en 30d")
         signals["insider_cluster_buy"] = False
     else:
         signals["insider_cluster_buy"] = False
@@ -247,7 +313,7 @@ def _check_extra_signals(ticker_data: dict) -> dict:
         signals["insider_mspr"] = round(insider_mspr, 3)
         # MSPR > 0.5 refuerza la señal alcista de insiders
         if insider_mspr > 0.5 and total_buys > 0:
-            reasoning.append(f"  MSPR={insider_mspr:.2f} (>0.5 confirma presión compradora de insiders)")
+            reasoning.append(("  MSPR={:.2f} (>0.5 confirma presión compradora de insiders)", insider_mspr))
 
     # 4. News Sentiment NLP (Finnhub /news-sentiment)
     news_score = ticker_data.get("news_sentiment_score")
@@ -256,11 +322,11 @@ def _check_extra_signals(ticker_data: dict) -> dict:
     if news_score is not None and news_articles >= 3:
         if news_score > 0.3:
             score += 1
-            reasoning.append(f"✓ Sentimiento NLP alcista: {news_score:+.2f} ({news_articles} artículos/semana)")
+            reasoning.append(("✓ Sentimiento NLP alcista: {:+.2f} ({} artículos/semana)", news_score, news_articles))
         elif news_score < -0.3:
             # Penalización: noticias negativas reducen la convicción
             score -= 1
-            reasoning.append(f"✗ Sentimiento NLP bajista: {news_score:+.2f} — riesgo de presión vendedora")
+            reasoning.append(("✗ Sentimiento NLP bajista: {:+.2f} — riesgo de presión vendedora", news_score))
         signals["news_sentiment"] = round(news_score, 3)
 
     return {"score": score, "reasoning": reasoning, "signals": signals}
@@ -0,0 +1,56 @@
+"""
+TickerFeatures — campos numéricos de ticker_data extraídos una sola vez
+
+El aggregator desempaqueta ticker_data al principio de cada evaluación y pasa la
+tupla a los evaluadores numéricos (turtles, seykota, risk_reward) en vez de que cada
+uno repita los dict.get(). Los defaults son los mismos que usaban los evaluadores.
+"""
+
+from typing import Dict, NamedTuple, Optional
+
+
+class TickerFeatures(NamedTuple):
+    price: float
+    ema_20: float
+    ema_50: float
+    ema_200: float
+    price_10d_ago: float
+    atr_14: float
+    beta: float
+    change_pct: float
+    sector: Optional[str]
+    historical_earnings_reaction: float
+    high_20d: float
+    avg_volume_20d: float
+    volume: float
+    high_52w: float
+    low_52w: float
+    price_60d_ago: float
+    spy_price_60d_ago: float
+    spy_price: float
+
+    @classmethod
+    def from_dict(cls, ticker_data: Dict) -> "TickerFeatures":
+        """Construye las features desde el dict de market_analyzer."""
+        get = ticker_data.get
+        price = get("price", 0)
+        return cls(
+            price=price,
+            ema_20=get("ema_20", 0),
+            ema_50=get("ema_50", 0),
+            ema_200=get("ema_200", 0),
+            price_10d_ago=get("price_10d_ago", price),
+            atr_14=get("atr_14", 0),
+            beta=get("beta", 1.5),
+            change_pct=get("change_pct", 0),
+            sector=get("sector"),
+            historical_earnings_reaction=get("historical_earnings_reaction", 0),
+            high_20d=get("high_20d") or 0,
+            avg_volume_20d=get("avg_volume_20d", 1),
+            volume=get("volume", 0),
+            high_52w=get("52w_high", 0),
+            low_52w=get("52w_low", 0),
+            price_60d_ago=get("price_60d_ago", price),
+            spy_price_60d_ago=get("spy_price_60d_ago", 0),
+            spy_price=get("spy_price", 0)
+        )
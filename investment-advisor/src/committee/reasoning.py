@@ -0,0 +1,26 @@
+"""
+Reasoning diferido — formateo de textos solo cuando se van a mostrar
+
+Los evaluadores registran cada línea de reasoning como una tupla
+(plantilla, *args) en vez de formatear el f-string en el momento. En un scan
+la gran mayoría de tickers acaban en SKIP/REJECT y su reasoning nunca se
+muestra, así que el formateo se hace solo para BUY/WATCHLIST (ver aggregator.py).
+
+Un registro puede ser también un str ya formateado (textos fijos).
+"""
+
+from typing import Iterable, List, Tuple, Union
+
+ReasoningRecord = Union[str, Tuple]
+
+
+def render_reasoning(records: Iterable[ReasoningRecord]) -> List[str]:
+    """Formatea una lista de registros de reasoning a strings."""
+    rendered = []
+    for record in records:
+        if isinstance(record, str):
+            rendered.append(record)
+        else:
+            template, *args = record
+            rendered.append(template.format(*args))
+    return rendered
@@ -6,10 +6,54 @@ Detector de Régimen de Mercado - Inspirado en Stanley Druckenmiller
 Puntuación: 0-15 puntos
 """
 
+import re
+from collections import namedtuple
+from functools import lru_cache
 from typing import Dict, Optional
 
+from .results import RegimeResult
 
-def detect_regime(market_data: Dict) -> Dict:
+
+# Sesgo sectorial por régimen. Constantes de módulo (ya en lowercase) compartidas por
+# todas las llamadas: detect_regime() devuelve referencias, no listas nuevas.
+_RISK_ON_BIAS = {
+    "boost": ("tech", "consumer_discretionary", "semiconductors"),
+    "penalize": ()
+}
+_RISK_OFF_BIAS = {
+    "boost": ("utilities", "healthcare", "staples"),
+    "penalize": ("tech", "growth", "small_caps")
+}
+_NEUTRAL_BIAS = {
+    "boost": (),
+    "penalize": ()
+}
+
+
+# Ajuste de score por sesgo sectorial
+_SECTOR_BOOST_PTS = 5
+_SECTOR_PENALTY_PTS = -10
+
+
+@lru_cache(maxsize=None)
+def _bias_pattern(words: tuple) -> Optional["re.Pattern"]:
+    """Alternación compilada de las palabras de sesgo (un solo scan en C por sector)."""
+    if not words:
+        return None
+    return re.compile("|".join(re.escape(w) for w in words))
+
+
+# Precompilar los patrones de los sesgos conocidos al importar el módulo
+for _bias in (_RISK_ON_BIAS, _RISK_OFF_BIAS, _NEUTRAL_BIAS):
+    _bias_pattern(_bias["boost"])
+    _bias_pattern(_bias["penalize"])
+
+# Régimen ya resuelto para todo un batch de tickers (constante durante el screening).
+# boost/penalize son las tuplas lowercase de sector_bias (matching por substring).
+RegimeContext = namedtuple("RegimeContext", "regime score boost penalize")
+
+
+def detect_regime(market_data: Dict) -> RegimeResult:
     """
     Analiza condiciones macro y retorna régimen + score parcial.
 
@@ -24,85 +68,93 @@ def detect_regime(market_data: Dict) -> Dict:
         }
 
     Returns:
-        {
-            "regime": str,
-            "score": int (0-15),
-            "reasoning": str,
-            "sector_bias": dict
-        }
+        RegimeResult(regime, score 0-15, reasoning, sector_bias)
+
+        El resultado se comparte entre llamadas con el mismo market_data
+        (memoizado); es inmutable.
     """
     vix = market_data.get("vix")
-    sp500_change = market_data.get("sp500_change", 0)
     spy_trend = market_data.get("spy_above_200ema", True)  # Asumimos alcista si no hay dato
     breadth = market_data.get("advance_decline_ratio", 1.0)
 
+    return _detect_regime_frozen(vix, spy_trend, breadth)
+
+
+def build_regime_context(market_data: Dict) -> RegimeContext:
+    """
+    Detecta el régimen una sola vez y lo empaqueta para evaluar muchos tickers.
+
+    Returns:
+        RegimeContext(regime=RegimeResult de detect_regime(), score, boost, penalize)
+    """
+    regime = detect_regime(market_data)
+    sector_bias = regime.sector_bias
+    return RegimeContext(
+        regime=regime,
+        score=regime.score,
+        boost=sector_bias.get("boost", ()),
+        penalize=sector_bias.get("penalize", ())
+    )
+
+
+@lru_cache(maxsize=32)
+def _detect_regime_frozen(vix: Optional[float], spy_trend: bool, breadth: float) -> RegimeResult:
+    """Clasificación del régimen a partir de los inputs ya extraídos (cacheable)."""
     # Si no hay VIX, asumir régimen neutral
     if vix is None:
-        return {
-            "regime": "unknown",
-            "score": 10,
-            "reasoning": "Sin datos de VIX - asumiendo condiciones neutras",
-            "sector_bias": {"boost": [], "penalize": []}
-        }
+        return RegimeResult(
+            regime="unknown",
+            score=10,
+            reasoning="Sin datos de VIX - asumiendo condiciones neutras",
+            sector_bias=_NEUTRAL_BIAS
+        )
 
     # Régimen: RISK-ON (favorable para longs)
     if vix < 18 and spy_trend and breadth >= 1.2:
-        return {
-            "regime": "risk_on",
-            "score": 15,
-            "reasoning": f"VIX bajo ({vix:.1f}), SPY sobre 200 EMA, breadth expansiva ({breadth:.2f}). Entorno óptimo para breakouts.",
-            "sector_bias": {
-                "boost": ["tech", "consumer_discretionary", "semiconductors"],
-                "penalize": []
-            }
-        }
+        return RegimeResult(
+            regime="risk_on",
+            score=15,
+            reasoning=f"VIX bajo ({vix:.1f}), SPY sobre 200 EMA, breadth expansiva ({breadth:.2f}). Entorno óptimo para breakouts.",
+            sector_bias=_RISK_ON_BIAS
+        )
 
     # Régimen: RISK-ON moderado (solo VIX bajo)
     if vix < 18 and spy_trend:
-        return {
-            "regime": "risk_on",
-            "score": 15,
-            "reasoning": f"VIX bajo ({vix:.1f}), mercado en tendencia alcista. Buen entorno para longs.",
-            "sector_bias": {
-                "boost": ["tech", "consumer_discretionary", "semiconductors"],
-                "penalize": []
-            }
-        }
+        return RegimeResult(
+            regime="risk_on",
+            score=15,
+            reasoning=f"VIX bajo ({vix:.1f}), mercado en tendencia alcista. Buen entorno para longs.",
+            sector_bias=_RISK_ON_BIAS
+        )
 
     # Régimen: RISK-OFF (defensivo)
     if vix > 25 or (vix > 20 and not spy_trend):
         score = 5 if vix < 30 else 0  # Pánico extremo = no operar
         severity = "extremo" if vix >= 30 else "alto"
-        return {
-            "regime": "risk_off",
-            "score": score,
-            "reasoning": f"VIX {severity} ({vix:.1f}), mercado en modo defensivo. Solo trend following en activos refugio.",
-            "sector_bias": {
-                "boost": ["utilities", "healthcare", "staples"],
-                "penalize": ["tech", "growth", "small_caps"]
-            }
-        }
+        return RegimeResult(
+            regime="risk_off",
+            score=score,
+            reasoning=f"VIX {severity} ({vix:.1f}), mercado en modo defensivo. Solo trend following en activos refugio.",
+            sector_bias=_RISK_OFF_BIAS
+        )
 
     # Régimen: NEUTRAL (selectivo)
-    return {
-        "regime": "neutral",
-        "score": 10,
-        "reasoning": f"VIX moderado ({vix:.1f}), condiciones mixtas. Operar solo setups de alta convicción.",
-        "sector_bias": {
-            "boost": [],
-            "penalize": []
-        }
-    }
+    return RegimeResult(
+        regime="neutral",
+        score=10,
+        reasoning=f"VIX moderado ({vix:.1f}), condiciones mixtas. Operar solo setups de alta convicción.",
+        sector_bias=_NEUTRAL_BIAS
+    )
 
 
-def apply_sector_adjustment(base_score: int, sector: Optional[str], regime_info: Dict) -> int:
+def apply_sector_adjustment(base_score: int, sector: Optional[str], regime_info: RegimeResult) -> int:
     """
     Ajusta score según sector y régimen.
 
     Args:
         base_score: Score base antes del ajuste
         sector: Sector del ticker (puede ser None)
-        regime_info: Dict retornado por detect_regime()
+        regime_info: RegimeResult de detect_regime() (sector_bias en lowercase)
 
     Returns:
         Score ajustado (+5 boost o -10 penalización)
@@ -110,19 +162,24 @@ def apply_sector_adjustment(base_score: int, sector: Optional[str], regime_info:
     if not sector:
         return base_score
 
-    sector_bias = regime_info.get("sector_bias", {})
-    boost = sector_bias.get("boost", [])
-    penalize = sector_bias.get("penalize", [])
+    sector_bias = regime_info.sector_bias
+    boost = sector_bias.get("boost", ())
+    penalize = sector_bias.get("penalize", ())
+
+    if not boost and not penalize:
+        return base_score
 
     # Normalizar sector a lowercase para comparar
     sector_lower = sector.lower()
+    boost_re = _bias_pattern(tuple(boost))
+    penalize_re = _bias_pattern(tuple(penalize))
 
     # Boost (+5 puntos)
-    if any(b.lower() in sector_lower for b in boost):
-        return min(base_score + 5, 100)
+    if boost_re is not None and boost_re.search(sector_lower):
+        return min(base_score + _SECTOR_BOOST_PTS, 100)
 
     # Penalización (-10 puntos)
-    if any(p.lower() in sector_lower for p in penalize):
-        return max(base_score - 10, 0)
+    if penalize_re is not None and penalize_re.search(sector_lower):
+        return max(base_score + _SECTOR_PENALTY_PTS, 0)
 
     return base_score
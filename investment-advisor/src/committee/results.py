@@ -0,0 +1,29 @@
+"""
+Contenedores de resultado de los evaluadores del comité
+
+Cada evaluador devuelve un objeto slotted e inmutable en vez de un dict anidado:
+menos memoria por ticker y acceso por atributo. La conversión a dict (JSON) se
+hace solo en el borde, en aggregator.py, con dataclasses.asdict().
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(slots=True, frozen=True)
+class ScoreResult:
+    """Resultado de un evaluador de componente (turtles, seykota, catalyst, risk_reward)."""
+    style: str
+    score: int
+    max_score: int
+    reasoning: list  # registros diferidos (ver reasoning.py)
+    signals: dict
+    hard_reject: bool = False
+
+
+@dataclass(slots=True, frozen=True)
+class RegimeResult:
+    """Resultado de detect_regime()."""
+    regime: str
+    score: int
+    reasoning: str
+    sector_bias: dict
@@ -9,17 +9,84 @@ Puntuación: 0-15 puntos distribuidos en:
 - Position size coherente con ATR: 3 pts
 """
 
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
+
+from ._njit import aot_kernel, njit
+from .features import TickerFeatures
+from .results import ScoreResult
+
+
+# Escalas de puntos (umbral, puntos), evaluadas de mayor a menor
+_RR_LADDER = ((4.0, 8), (3.0, 6), (2.0, 3))
+# Stop en múltiplos de ATR: (mínimo, máximo, puntos)
+_STOP_ATR_LADDER = ((1.5, 2.5, 4), (1.0, 3.0, 2))
+
+# Códigos de estado de _rr_kernel
+_OK = 0
+_INVALID_PRICES = 1
+_INVALID_STOP = 2
+
+
+@njit(cache=True)
+def _rr_kernel(entry_price, stop_price, target_price, atr, price, capital, leverage):
+    """
+    Kernel numérico de evaluate_risk_reward (compilable con numba).
+
+    Returns:
+        (status, rr_ratio, rr_points, stop_points, sizing_points, position_value)
+    """
+    if entry_price <= 0 or stop_price <= 0 or target_price <= 0:
+        return _INVALID_PRICES, 0.0, 0, 0, 0, 0.0
+
+    risk = entry_price - stop_price
+    if risk <= 0:
+        return _INVALID_STOP, 0.0, 0, 0, 0, 0.0
+
+    rr_ratio = (target_price - entry_price) / risk
+
+    # 1. R/R ratio
+    rr_points = 0
+    for threshold, points in _RR_LADDER:
+        if rr_ratio >= threshold:
+            rr_points = points
+            break
+
+    # 2. Stop vs ATR (sin ATR: 2 pts si el stop es <= 7%)
+    stop_points = 0
+    if atr > 0 and price > 0:
+        stop_in_atr = risk / atr
+        for low, high, points in _STOP_ATR_LADDER:
+            if low <= stop_in_atr <= high:
+                stop_points = points
+                break
+    elif risk / entry_price * 100 <= 7:
+        stop_points = 2
+
+    # 3. Sizing: riesgo máximo 2% del capital, exposición máxima capital × leverage
+    exposure_total = capital * leverage
+    position_value = (capital * 0.02) / risk * entry_price
+    sizing_points = 0
+    if position_value <= exposure_total:
+        sizing_points = 3
+    elif position_value <= exposure_total * 1.2:
+        sizing_points = 1
+
+    return _OK, rr_ratio, rr_points, stop_points, sizing_points, position_value
+
+
+# Llamadas escalares: kernel precompilado si existe (ver scripts/build_kernels.py).
+# batch.py sigue usando la versión @njit, que es la que se puede llamar desde prange.
+_rr_score = aot_kernel("rr_score", _rr_kernel)
 
 
 def evaluate_risk_reward(
-    ticker_data: Dict,
+    ticker_data: Union[TickerFeatures, Dict],
     entry_price: float,
     stop_price: float,
     target_price: float,
     capital: float = 500.0,
     leverage: int = 5
-) -> Dict:
+) -> ScoreResult:
     """
     Evalúa si el trade tiene edge estadístico favorable.
 
@@ -28,6 +95,7 @@ def evaluate_risk_reward(
             "atr_14": float,
             "price": float
         }
+        (o un TickerFeatures ya desempaquetado)
         entry_price: Precio de entrada propuesto
         stop_price: Stop loss propuesto
         target_price: Take profit propuesto
@@ -35,135 +103,110 @@ def evaluate_risk_reward(
         leverage: Apalancamiento (default 5x)
 
     Returns:
-        {
-            "style": "risk_reward",
-            "score": int (0-15),
-            "max_score": 15,
-            "reasoning": list[str],
-            "signals": dict,
-            "hard_reject": bool  # True si R/R < 3 (rechazar aunque score >= 75)
-        }
+        ScoreResult(style="risk_reward", score 0-15, max_score=15,
+                    hard_reject=True si R/R < 3 — rechazar aunque score >= 75)
     """
-    atr = ticker_data.get("atr_14", 0)
-    price = ticker_data.get("price", entry_price)
+    if isinstance(ticker_data, TickerFeatures):
+        atr = ticker_data.atr_14
+        price = ticker_data.price
+    else:
+        atr = ticker_data.get("atr_14", 0)
+        price = ticker_data.get("price", entry_price)
 
-    score = 0
-    reasoning = []
+    status, rr_ratio, rr_points, stop_points, sizing_points, position_value = _rr_score(
+        float(entry_price), float(stop_price), float(target_price), float(atr), float(price),
+        float(capital), float(leverage)
+    )
 
     # Validación de inputs
-    if entry_price <= 0 or stop_price <= 0 or target_price <= 0:
-        return {
-            "style": "risk_reward",
-            "score": 0,
-            "max_score": 15,
-            "reasoning": ["✗ Precios inválidos para cálculo de R/R"],
-            "signals": {
+    if status == _INVALID_PRICES:
+        return ScoreResult(
+            style="risk_reward",
+            score=0,
+            max_score=15,
+            reasoning=["✗ Precios inválidos para cálculo de R/R"],
+            signals={
                 "rr_ratio": 0,
                 "stop_atr_multiple": 0,
                 "suggested_position_eur": 0,
                 "risk_eur": 0,
                 "stop_pct": 0
             },
-            "hard_reject": True
-        }
-
-    # Calcular riesgo y recompensa
-    risk = entry_price - stop_price
-    reward = target_price - entry_price
-
-    if risk <= 0:
-        return {
-            "style": "risk_reward",
-            "score": 0,
-            "max_score": 15,
-            "reasoning": ["✗ Stop loss inválido (debe estar por debajo del entry)"],
-            "signals": {
+            hard_reject=True
+        )
+
+    if status == _INVALID_STOP:
+        return ScoreResult(
+            style="risk_reward",
+            score=0,
+            max_score=15,
+            reasoning=["✗ Stop loss inválido (debe estar por debajo del entry)"],
+            signals={
                 "rr_ratio": 0,
                 "stop_atr_multiple": 0,
                 "suggested_position_eur": 0,
                 "risk_eur": capital * 0.02,
                 "stop_pct": 0
             },
-            "hard_reject": True
-        }
+            hard_reject=True
+        )
 
-    rr_ratio = reward / risk
+    risk = entry_price - stop_price
+    max_risk_eur = capital * 0.02
+    exposure_total = capital * leverage
+    reasoning = []
 
     # 1. R/R ratio - core del edge (8 puntos máximo)
-    if rr_ratio >= 4:
-        score += 8
-        reasoning.append(f"✓ R/R excelente: {rr_ratio:.1f}:1")
-    elif rr_ratio >= 3:
-        score += 6
-        reasoning.append(f"✓ R/R aceptable: {rr_ratio:.1f}:1 (mínimo requerido)")
-    elif rr_ratio >= 2:
-        score += 3
-        reasoning.append(f"~ R/R marginal: {rr_ratio:.1f}:1 (bajo mínimo recomendado)")
+    if rr_points == 8:
+        reasoning.append(("✓ R/R excelente: {:.1f}:1", rr_ratio))
+    elif rr_points == 6:
+        reasoning.append(("✓ R/R aceptable: {:.1f}:1 (mínimo requerido)", rr_ratio))
+    elif rr_points == 3:
+        reasoning.append(("~ R/R marginal: {:.1f}:1 (bajo mínimo recomendado)", rr_ratio))
     else:
-        reasoning.append(f"✗ R/R insuficiente: {rr_ratio:.1f}:1 — NO OPERAR")
+        reasoning.append(("✗ R/R insuficiente: {:.1f}:1 — NO OPERAR", rr_ratio))
 
     # 2. Stop basado en ATR - estructura vs arbitrario (4 puntos)
     if atr > 0 and price > 0:
         stop_in_atr = risk / atr
-
-        if 1.5 <= stop_in_atr <= 2.5:
-            score += 4
-            reasoning.append(f"✓ Stop = {stop_in_atr:.1f}× ATR (bien estructurado)")
-        elif 1 <= stop_in_atr <= 3:
-            score += 2
-            reasoning.append(f"~ Stop = {stop_in_atr:.1f}× ATR (aceptable)")
+        if stop_points == 4:
+            reasoning.append(("✓ Stop = {:.1f}× ATR (bien estructurado)", stop_in_atr))
+        elif stop_points == 2:
+            reasoning.append(("~ Stop = {:.1f}× ATR (aceptable)", stop_in_atr))
+        elif stop_in_atr < 1:
+            reasoning.append(("✗ Stop = {:.1f}× ATR (muy ajustado — ruido puede sacarte)", stop_in_atr))
         else:
-            if stop_in_atr < 1:
-                reasoning.append(f"✗ Stop = {stop_in_atr:.1f}× ATR (muy ajustado — ruido puede sacarte)")
-            else:
-                reasoning.append(f"✗ Stop = {stop_in_atr:.1f}× ATR (muy amplio — riesgo excesivo)")
+            reasoning.append(("✗ Stop = {:.1f}× ATR (muy amplio — riesgo excesivo)", stop_in_atr))
     else:
-        # Sin ATR, dar puntos parciales si el stop es razonable (< 10%)
+        # Sin ATR, puntos parciales si el stop es razonable
         stop_pct = risk / entry_price * 100
-        if stop_pct <= 7:
-            score += 2
-            reasoning.append(f"~ Stop {stop_pct:.1f}% sin datos de ATR (asumiendo razonable)")
+        if stop_points == 2:
+            reasoning.append(("~ Stop {:.1f}% sin datos de ATR (asumiendo razonable)", stop_pct))
         else:
-            reasoning.append(f"✗ Stop {stop_pct:.1f}% sin datos de ATR para validar")
+            reasoning.append(("✗ Stop {:.1f}% sin datos de ATR para validar", stop_pct))
 
     # 3. Validación de sizing (3 puntos)
-    # Con 500€ y x5 leverage, exposición max = 2500€
-    # Riesgo máximo 2% del capital = 10€ por trade
-    max_risk_eur = capital * 0.02
-    exposure_total = capital * leverage
-
-    if risk > 0:
-        # Cuántas shares podemos comprar para arriesgar max 10€
-        shares_by_risk = max_risk_eur / risk
-        position_value = shares_by_risk * entry_price
-
-        # ¿Cabe en nuestra capacidad de apalancamiento?
-        if position_value <= exposure_total:
-            score += 3
-            reasoning.append(f"✓ Sizing viable: €{position_value:.0f} exposición para €{max_risk_eur:.0f} riesgo")
-        elif position_value <= exposure_total * 1.2:
-            score += 1
-            reasoning.append(f"~ Sizing ajustado: €{position_value:.0f} (límite €{exposure_total:.0f})")
-        else:
-            reasoning.append(f"✗ Sizing excede capacidad: necesitaría €{position_value:.0f} (límite €{exposure_total:.0f})")
+    if sizing_points == 3:
+        reasoning.append(("✓ Sizing viable: €{:.0f} exposición para €{:.0f} riesgo", position_value, max_risk_eur))
+    elif sizing_points == 1:
+        reasoning.append(("~ Sizing ajustado: €{:.0f} (límite €{:.0f})", position_value, exposure_total))
     else:
-        reasoning.append(f"✗ No se puede calcular sizing (riesgo inválido)")
-        position_value = 0
+        reasoning.append(("✗ Sizing excede capacidad: necesitaría €{:.0f} (límite €{:.0f})", position_value, exposure_total))
 
     # Hard reject: R/R < 3 es condición eliminatoria
     hard_reject = rr_ratio < 3.0
 
-    return {
-        "style": "risk_reward",
-        "score": score,
-        "max_score": 15,
-        "reasoning": reasoning,
-        "signals": {
+    return ScoreResult(
+        style="risk_reward",
+        score=int(rr_points + stop_points + sizing_points),
+        max_score=15,
+        reasoning=reasoning,
+        signals={
             "rr_ratio": round(rr_ratio, 2),
             "stop_atr_multiple": round(risk / atr, 2) if atr > 0 else 0,
             "suggested_position_eur": min(position_value, exposure_total) if position_value > 0 else 0,
             "risk_eur": max_risk_eur,
             "stop_pct": round(risk / entry_price * 100, 2)
         },
-        "hard_reject": hard_reject
-    }
+        hard_reject=hard_reject
+    )
@@ -11,7 +11,11 @@ Puntuación: 0-20 puntos distribuidos en:
 - Momentum positivo (10 días): 4 pts
 """
 
-from typing import Dict
+from typing import Dict, Union
+
+from ._njit import aot_kernel, njit
+from .features import TickerFeatures
+from .results import ScoreResult
 
 
 def compute_weinstein_stage(ticker_data: Dict) -> int:
@@ -42,7 +46,67 @@ def compute_weinstein_stage(ticker_data: Dict) -> int:
         return 4 if not sma_rising else 1
 
 
-def evaluate_seykota(ticker_data: Dict) -> Dict:
+@njit(cache=True)
+def _seykota_score_kernel(price, ema_20, ema_50, ema_200, price_10d_ago):
+    """
+    Kernel numérico del scoring Seykota (sin strings ni dicts, compilable con numba).
+
+    Returns:
+        (score, trend_aligned, momentum_10d, above_ema20, emas_golden)
+    """
+    score = 0
+    all_positive = (price > 0) & (ema_20 > 0) & (ema_50 > 0) & (ema_200 > 0)
+
+    # 1. Precio sobre EMA corta (6 puntos)
+    if price > 0 and ema_20 > 0:
+        if price > ema_20:
+            score += 6
+        elif price >= ema_20 * 0.97:  # Muy cerca (3%)
+            score += 3
+
+    # 2. EMAs alineadas - golden cross structure (6 puntos)
+    emas_golden = False
+    if ema_20 > 0 and ema_50 > 0:
+        emas_golden = ema_20 > ema_50
+        if emas_golden:
+            score += 6
+
+    # 3. Tendencia de largo plazo (4 puntos)
+    if ema_50 > 0 and ema_200 > 0:
+        if ema_50 > ema_200:
+            score += 4
+    elif ema_50 > 0:
+        score += 2  # Sin EMA200: puntos neutros
+
+    # 4. Momentum reciente (4 puntos)
+    momentum = 0.0
+    if price_10d_ago > 0:
+        momentum = (price - price_10d_ago) / price_10d_ago * 100
+        if price > 0:
+            if momentum > 5:
+                score += 4
+            elif momentum > 2:
+                score += 3
+            elif momentum > 0:
+                score += 2
+            elif momentum > -3:
+                score += 1
+
+    trend_aligned = False
+    if all_positive:
+        trend_aligned = price > ema_20 > ema_50 > ema_200
+
+    above_ema20 = price > ema_20 if ema_20 > 0 else False
+
+    return score, trend_aligned, momentum, above_ema20, emas_golden
+
+
+# Llamadas escalares: kernel precompilado si existe (ver scripts/build_kernels.py).
+# batch.py sigue usando la versión @njit, que es la que se puede llamar desde prange.
+_seykota_score = aot_kernel("seykota_score", _seykota_score_kernel)
+
+
+def evaluate_seykota(ticker_data: Union[TickerFeatures, Dict]) -> ScoreResult:
     """
     Evalúa alineación con tendencia (trend following).
 
@@ -54,102 +118,87 @@ def evaluate_seykota(ticker_data: Dict) -> Dict:
             "ema_200": float,
             "price_10d_ago": float
         }
+        (o un TickerFeatures ya desempaquetado)
 
     Returns:
-        {
-            "style": "seykota",
-            "score": int (0-20),
-            "max_score": 20,
-            "reasoning": list[str],
-            "signals": dict
-        }
+        ScoreResult(style="seykota", score 0-20, max_score=20)
     """
-    price = ticker_data.get("price", 0)
-    ema_20 = ticker_data.get("ema_20", 0)
-    ema_50 = ticker_data.get("ema_50", 0)
-    ema_200 = ticker_data.get("ema_200", 0)
-    price_10d_ago = ticker_data.get("price_10d_ago", price)
+    if not isinstance(ticker_data, TickerFeatures):
+        ticker_data = TickerFeatures.from_dict(ticker_data)
+    price = ticker_data.price
+    ema_20 = ticker_data.ema_20
+    ema_50 = ticker_data.ema_50
+    ema_200 = ticker_data.ema_200
+    price_10d_ago = ticker_data.price_10d_ago
+
+    score, trend_aligned, momentum, above_ema20, emas_golden = _seykota_score(
+        float(price), float(ema_20), float(ema_50), float(ema_200), float(price_10d_ago)
+    )
 
-    score = 0
+    return ScoreResult(
+        style="seykota",
+        score=int(score),
+        max_score=20,
+        reasoning=_seykota_reasoning(price, ema_20, ema_50, ema_200, price_10d_ago, momentum),
+        signals={
+            "trend_aligned": bool(trend_aligned),
+            "momentum_10d": momentum if price_10d_ago > 0 else 0,
+            "above_ema20": bool(above_ema20),
+            "emas_golden": bool(emas_golden)
+        }
+    )
+
+
+def _seykota_reasoning(price, ema_20, ema_50, ema_200, price_10d_ago, momentum) -> list:
+    """Registros de reasoning de cada criterio (mismas ramas que _seykota_score_kernel)."""
     reasoning = []
 
-    # 1. Precio sobre EMA corta (6 puntos)
+    # 1. Precio vs EMA20
     if price > 0 and ema_20 > 0:
         if price > ema_20:
-            score += 6
             pct_above = (price - ema_20) / ema_20 * 100
-            reasoning.append(f"✓ Precio > EMA20 (+{pct_above:.1f}% — tendencia corto plazo alcista)")
-        elif price >= ema_20 * 0.97:  # Muy cerca (3%)
-            score += 3
-            reasoning.append(f"~ Precio cerca de EMA20 (soporte clave)")
+            reasoning.append(("✓ Precio > EMA20 (+{:.1f}% — tendencia corto plazo alcista)", pct_above))
+        elif price >= ema_20 * 0.97:
+            reasoning.append("~ Precio cerca de EMA20 (soporte clave)")
         else:
             pct_below = (ema_20 - price) / ema_20 * 100
-            reasoning.append(f"✗ Precio < EMA20 (-{pct_below:.1f}% — debilidad corto plazo)")
+            reasoning.append(("✗ Precio < EMA20 (-{:.1f}% — debilidad corto plazo)", pct_below))
     else:
-        reasoning.append(f"✗ Sin datos de EMA20")
+        reasoning.append("✗ Sin datos de EMA20")
 
-    # 2. EMAs alineadas - golden cross structure (6 puntos)
+    # 2. Estructura EMA20/EMA50
     if ema_20 > 0 and ema_50 > 0:
         if ema_20 > ema_50:
-            score += 6
-            reasoning.append(f"✓ EMA20 > EMA50 (estructura alcista)")
+            reasoning.append("✓ EMA20 > EMA50 (estructura alcista)")
         else:
-            reasoning.append(f"✗ EMA20 < EMA50 (cruce bajista)")
+            reasoning.append("✗ EMA20 < EMA50 (cruce bajista)")
     else:
-        reasoning.append(f"✗ Sin datos de EMAs para estructura")
+        reasoning.append("✗ Sin datos de EMAs para estructura")
 
-    # 3. Tendencia de largo plazo (4 puntos)
+    # 3. Tendencia de largo plazo
     if ema_50 > 0 and ema_200 > 0:
         if ema_50 > ema_200:
-            score += 4
-            reasoning.append(f"✓ EMA50 > EMA200 (tendencia mayor alcista)")
+            reasoning.append("✓ EMA50 > EMA200 (tendencia mayor alcista)")
         else:
-            reasoning.append(f"✗ EMA50 < EMA200 (tendencia mayor bajista — contracorriente)")
+            reasoning.append("✗ EMA50 < EMA200 (tendencia mayor bajista — contracorriente)")
+    elif ema_50 > 0:
+        reasoning.append("~ Sin EMA200 (asumiendo tendencia neutral)")
     else:
-        # Si no hay EMA200, dar puntos neutros si EMA50 existe
-        if ema_50 > 0:
-            score += 2
-            reasoning.append(f"~ Sin EMA200 (asumiendo tendencia neutral)")
-        else:
-            reasoning.append(f"✗ Sin datos de EMAs largas")
+        reasoning.append("✗ Sin datos de EMAs largas")
 
-    # 4. Momentum reciente (4 puntos)
+    # 4. Momentum reciente
     if price > 0 and price_10d_ago > 0:
-        momentum = (price - price_10d_ago) / price_10d_ago * 100
-
         if momentum > 5:
-            score += 4
-            reasoning.append(f"✓ Momentum fuerte +{momentum:.1f}% en 10d")
+            reasoning.append(("✓ Momentum fuerte +{:.1f}% en 10d", momentum))
         elif momentum > 2:
-            score += 3
-            reasoning.append(f"✓ Momentum positivo +{momentum:.1f}% en 10d")
+            reasoning.append(("✓ Momentum positivo +{:.1f}% en 10d", momentum))
         elif momentum > 0:
-            score += 2
-            reasoning.append(f"~ Momentum leve +{momentum:.1f}% en 10d")
+            reasoning.append(("~ Momentum leve +{:.1f}% en 10d", momentum))
         elif momentum > -3:
-            score += 1
-            reasoning.append(f"~ Momentum casi plano {momentum:.1f}% en 10d")
+            reasoning.append(("~ Momentum casi plano {:.1f}% en 10d", momentum))
         else:
-            reasoning.append(f"✗ Momentum negativo {momentum:.1f}% en 10d")
+            reasoning.append(("✗ Momentum negativo {:.1f}% en 10d", momentum))
     else:
-        reasoning.append(f"✗ Sin datos de momentum")
+        reasoning.append("✗ Sin datos de momentum")
 
-    # Señal de tendencia completamente alineada
-    trend_aligned = (
-        price > ema_20 > ema_50 > ema_200
-        if all(x > 0 for x in [price, ema_20, ema_50, ema_200])
-        else False
-    )
-
-    return {
-        "style": "seykota",
-        "score": score,
-        "max_score": 20,
-        "reasoning": reasoning,
-        "signals": {
-            "trend_aligned": trend_aligned,
-            "momentum_10d": (price - price_10d_ago) / price_10d_ago * 100 if price_10d_ago > 0 else 0,
-            "above_ema20": price > ema_20 if ema_20 > 0 else False,
-            "emas_golden": ema_20 > ema_50 if all(x > 0 for x in [ema_20, ema_50]) else False
-        }
-    }
+    return reasoning
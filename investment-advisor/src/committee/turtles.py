@@ -18,10 +18,98 @@ Puntuación: 0-25 puntos
 - No sobreextendido: 3 pts
 """
 
-from typing import Dict
+from typing import Dict, Union
 
+from ._njit import aot_kernel, njit
+from .features import TickerFeatures
+from .results import ScoreResult
 
-def evaluate_turtles(ticker_data: Dict) -> Dict:
+
+@njit(cache=True)
+def _turtles_score_kernel(price, high_20d, avg_volume, volume, atr, high_52w, low_52w,
+                          price_60d_ago, spy_price_60d_ago, spy_price):
+    """
+    Kernel numérico del scoring Turtles/Minervini (sin strings ni dicts, compilable con numba).
+
+    Returns:
+        (score, breakout, pct_over_pivot, volume_ratio, atr_pct, has_rs, rs_ratio)
+    """
+    # Sin histórico: score 0 (evaluate_turtles responde con _empty_result)
+    if high_20d <= 0 or avg_volume <= 0:
+        return 0, False, 0.0, 0.0, 0.0, False, 1.0
+
+    # Magnitudes derivadas, calculadas una sola vez
+    breakout = price > high_20d
+    pct_over = (price - high_20d) / high_20d * 100  # >0 sobre el pivote
+    volume_ratio = volume / avg_volume
+    atr_pct = atr / price * 100 if price > 0 and atr > 0 else 0.0
+
+    score = 0
+
+    # 1. Breakout de 20 días (7 puntos) — Turtles core
+    if breakout:
+        score += 7
+    elif price >= high_20d * 0.98:
+        score += 4
+
+    # 2. Confirmación de volumen (5 puntos)
+    if volume_ratio > 1.5:
+        score += 5
+    elif volume_ratio > 1.2:
+        score += 3
+
+    # 3. Minervini criterios 5 & 6: rango de 52 semanas (5 puntos)
+    if high_52w > 0 and low_52w > 0:
+        if (price - low_52w) / low_52w * 100 >= 30:
+            score += 3
+        if (high_52w - price) / high_52w * 100 <= 25:
+            score += 2
+    else:
+        score += 2  # Puntos parciales si no hay datos de 52w
+
+    # 4. Relative Strength vs mercado (3 puntos) — Minervini criterio 7
+    has_rs = (price_60d_ago > 0) & (spy_price_60d_ago > 0) & (spy_price > 0)
+    rs_ratio = 1.0
+    if has_rs:
+        stock_return_60d = (price - price_60d_ago) / price_60d_ago
+        spy_return_60d = (spy_price - spy_price_60d_ago) / spy_price_60d_ago
+        if spy_return_60d != 0:
+            rs_ratio = stock_return_60d / spy_return_60d
+
+        if rs_ratio >= 1.5:
+            score += 3
+        elif rs_ratio >= 1.1:
+            score += 2
+        elif rs_ratio >= 0.8:
+            score += 1
+    else:
+        score += 1  # Neutro sin datos
+
+    # 5. No sobreextendido (3 puntos) — evitar chase
+    if breakout:
+        if pct_over < 5:
+            score += 3
+        elif pct_over < 10:
+            score += 1
+    else:
+        score += 2
+
+    # 6. ATR favorable para stop (2 puntos)
+    if atr_pct > 0:
+        if 2 <= atr_pct <= 6:
+            score += 2
+        elif 1 <= atr_pct <= 8:
+            score += 1
+
+    return min(score, 25), breakout, pct_over, volume_ratio, atr_pct, has_rs, rs_ratio
+
+
+# Llamadas escalares: kernel precompilado si existe (ver scripts/build_kernels.py).
+# batch.py sigue usando la versión @njit, que es la que se puede llamar desde prange.
+_turtles_score = aot_kernel("turtles_score", _turtles_score_kernel)
+
+
+def evaluate_turtles(ticker_data: Union[TickerFeatures, Dict]) -> ScoreResult:
     """
     Evalúa setup técnico combinando Minervini Trend Template + breakout con volumen.
 
@@ -37,133 +125,134 @@ def evaluate_turtles(ticker_data: Dict) -> Dict:
             "price_60d_ago": float,
             "spy_price_60d_ago": float  ← para RS relativa (viene de market_status)
         }
+        (o un TickerFeatures ya desempaquetado)
+
+    Returns:
+        ScoreResult(style="turtles_minervini", score 0-25, max_score=25)
     """
-    price = ticker_data.get("price", 0)
-    high_20d = ticker_data.get("high_20d", price)
-    avg_volume = ticker_data.get("avg_volume_20d", 1)
-    current_volume = ticker_data.get("volume", 0)
-    atr = ticker_data.get("atr_14", 0)
-    high_52w = ticker_data.get("52w_high", 0)
-    low_52w = ticker_data.get("52w_low", 0)
-    price_60d_ago = ticker_data.get("price_60d_ago", price)
-    spy_price_60d_ago = ticker_data.get("spy_price_60d_ago", 0)
-    spy_price = ticker_data.get("spy_price", 0)
+    if not isinstance(ticker_data, TickerFeatures):
+        ticker_data = TickerFeatures.from_dict(ticker_data)
+    price = ticker_data.price
+    high_20d = ticker_data.high_20d
+    avg_volume = ticker_data.avg_volume_20d
+    high_52w = ticker_data.high_52w
+    low_52w = ticker_data.low_52w
 
-    score = 0
+    # Sin máximo de 20 días o volumen medio no hay setup que evaluar (usar price como
+    # máximo por defecto daba un falso "cerca del breakout")
+    if high_20d <= 0 or avg_volume <= 0:
+        return _empty_result("Sin datos históricos (máximo 20d / volumen medio)")
+
+    score, breakout, pct_over, volume_ratio, atr_pct, has_rs, rs_ratio = _turtles_score(
+        float(price), float(high_20d), float(avg_volume), float(ticker_data.volume),
+        float(ticker_data.atr_14), float(high_52w), float(low_52w),
+        float(ticker_data.price_60d_ago), float(ticker_data.spy_price_60d_ago),
+        float(ticker_data.spy_price)
+    )
+
+    return ScoreResult(
+        style="turtles_minervini",
+        score=int(score),
+        max_score=25,
+        reasoning=_turtles_reasoning(
+            price, high_20d, high_52w, low_52w, breakout, pct_over, volume_ratio, atr_pct, has_rs, rs_ratio
+        ),
+        signals={
+            "breakout": bool(breakout),
+            "volume_confirmed": volume_ratio > 1.5,
+            "volume_ratio": round(volume_ratio, 2),
+            "atr_pct": round(atr_pct, 2),
+            "rs_vs_spy": round(rs_ratio, 2) if has_rs else None
+        }
+    )
+
+
+def _turtles_reasoning(price, high_20d, high_52w, low_52w, breakout, pct_over, volume_ratio,
+                       atr_pct, has_rs, rs_ratio) -> list:
+    """Registros de reasoning de cada criterio (mismas ramas que _turtles_score_kernel)."""
     reasoning = []
 
-    # 1. Breakout de 20 días (7 puntos) — Turtles core
-    if price > high_20d:
-        score += 7
-        pct_above = (price - high_20d) / high_20d * 100
-        reasoning.append(f"✓ Breakout: ${price:.2f} > máximo 20d ${high_20d:.2f} (+{pct_above:.1f}%)")
+    # 1. Breakout de 20 días
+    if breakout:
+        reasoning.append(("✓ Breakout: ${:.2f} > máximo 20d ${:.2f} (+{:.1f}%)", price, high_20d, pct_over))
     elif price >= high_20d * 0.98:
-        score += 4
-        pct_below = (high_20d - price) / high_20d * 100
-        reasoning.append(f"~ Cerca del breakout 20d: {pct_below:.1f}% bajo el pivote")
+        reasoning.append(("~ Cerca del breakout 20d: {:.1f}% bajo el pivote", abs(pct_over)))
     else:
-        pct_below = (high_20d - price) / high_20d * 100
-        reasoning.append(f"✗ Sin breakout 20d: {pct_below:.1f}% bajo máximo")
+        reasoning.append(("✗ Sin breakout 20d: {:.1f}% bajo máximo", abs(pct_over)))
 
-    # 2. Confirmación de volumen (5 puntos)
-    volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1.0
+    # 2. Confirmación de volumen
     if volume_ratio > 1.5:
-        score += 5
-        reasoning.append(f"✓ Volumen {volume_ratio:.1f}x promedio (confirmación fuerte)")
+        reasoning.append(("✓ Volumen {:.1f}x promedio (confirmación fuerte)", volume_ratio))
     elif volume_ratio > 1.2:
-        score += 3
-        reasoning.append(f"~ Volumen {volume_ratio:.1f}x promedio (confirmación moderada)")
+        reasoning.append(("~ Volumen {:.1f}x promedio (confirmación moderada)", volume_ratio))
     else:
-        reasoning.append(f"✗ Volumen {volume_ratio:.1f}x — insuficiente para confirmar")
+        reasoning.append(("✗ Volumen {:.1f}x — insuficiente para confirmar", volume_ratio))
 
-    # 3. Minervini criterios 5 & 6: rango de 52 semanas (5 puntos)
+    # 3. Minervini criterios 5 & 6
     # Crit. 5: precio >= 30% sobre mínimo anual (no está en fondo)
     # Crit. 6: precio dentro del 25% del máximo anual (cerca de highs)
-    range_score = 0
     if high_52w > 0 and low_52w > 0:
         pct_above_low = (price - low_52w) / low_52w * 100
         pct_below_high = (high_52w - price) / high_52w * 100
 
         if pct_above_low >= 30:
-            range_score += 3
-            reasoning.append(f"✓ {pct_above_low:.0f}% sobre mínimo anual (Minervini crit.5: ≥30%)")
+            reasoning.append(("✓ {:.0f}% sobre mínimo anual (Minervini crit.5: ≥30%)", pct_above_low))
         else:
-            reasoning.append(f"✗ Solo {pct_above_low:.0f}% sobre mínimo anual (<30% — posible Stage 1)")
+            reasoning.append(("✗ Solo {:.0f}% sobre mínimo anual (<30% — posible Stage 1)", pct_above_low))
 
         if pct_below_high <= 25:
-            range_score += 2
-            reasoning.append(f"✓ Dentro del {pct_below_high:.0f}% del máximo anual (Minervini crit.6: ≤25%)")
+            reasoning.append(("✓ Dentro del {:.0f}% del máximo anual (Minervini crit.6: ≤25%)", pct_below_high))
         else:
-            reasoning.append(f"✗ {pct_below_high:.0f}% bajo máximo anual (>25% — lejos de highs)")
+            reasoning.append(("✗ {:.0f}% bajo máximo anual (>25% — lejos de highs)", pct_below_high))
     else:
-        range_score += 2  # Puntos parciales si no hay datos de 52w
         reasoning.append("~ Sin datos de rango anual (asumiendo setup válido)")
 
-    score += range_score
-
-    # 4. Relative Strength vs mercado (3 puntos) — Minervini criterio 7
-    # RS 60 días: stock vs SPY
-    if price_60d_ago > 0 and spy_price_60d_ago > 0 and spy_price > 0:
-        stock_return_60d = (price - price_60d_ago) / price_60d_ago
-        spy_return_60d = (spy_price - spy_price_60d_ago) / spy_price_60d_ago
-        rs_ratio = stock_return_60d / spy_return_60d if spy_return_60d != 0 else 1.0
-
+    # 4. Relative Strength 60 días: stock vs SPY
+    if has_rs:
         if rs_ratio >= 1.5:
-            score += 3
-            reasoning.append(f"✓ RS {rs_ratio:.1f}x mercado en 60d (líder del mercado)")
+            reasoning.append(("✓ RS {:.1f}x mercado en 60d (líder del mercado)", rs_ratio))
         elif rs_ratio >= 1.1:
-            score += 2
-            reasoning.append(f"✓ RS {rs_ratio:.1f}x mercado (outperforming)")
+            reasoning.append(("✓ RS {:.1f}x mercado (outperforming)", rs_ratio))
         elif rs_ratio >= 0.8:
-            score += 1
-            reasoning.append(f"~ RS {rs_ratio:.1f}x mercado (inline con índice)")
+            reasoning.append(("~ RS {:.1f}x mercado (inline con índice)", rs_ratio))
         else:
-            reasoning.append(f"✗ RS {rs_ratio:.1f}x mercado — underperforming SPY")
+            reasoning.append(("✗ RS {:.1f}x mercado — underperforming SPY", rs_ratio))
     else:
-        score += 1  # Neutro sin datos
         reasoning.append("~ Sin datos de RS vs SPY (asumiendo neutral)")
 
-    # 5. No sobreextendido (3 puntos) — evitar chase
-    if price > high_20d:
-        extension = (price - high_20d) / high_20d * 100
-        if extension < 5:
-            score += 3
-            reasoning.append(f"✓ Entrada temprana: solo {extension:.1f}% sobre pivote")
-        elif extension < 10:
-            score += 1
-            reasoning.append(f"~ Extensión moderada: {extension:.1f}% sobre pivote")
+    # 5. Sobreextensión
+    if breakout:
+        if pct_over < 5:
+            reasoning.append(("✓ Entrada temprana: solo {:.1f}% sobre pivote", pct_over))
+        elif pct_over < 10:
+            reasoning.append(("~ Extensión moderada: {:.1f}% sobre pivote", pct_over))
         else:
-            reasoning.append(f"✗ Sobreextendido: {extension:.1f}% sobre pivote (chase risk)")
+            reasoning.append(("✗ Sobreextendido: {:.1f}% sobre pivote (chase risk)", pct_over))
     else:
-        score += 2
         reasoning.append("~ No en breakout, sin sobreextensión")
 
-    # 6. ATR favorable para stop (2 puntos)
-    if price > 0 and atr > 0:
-        atr_pct = atr / price * 100
+    # 6. ATR
+    if atr_pct > 0:
         if 2 <= atr_pct <= 6:
-            score += 2
-            reasoning.append(f"✓ ATR {atr_pct:.1f}% — stop manejable")
+            reasoning.append(("✓ ATR {:.1f}% — stop manejable", atr_pct))
         elif 1 <= atr_pct <= 8:
-            score += 1
-            reasoning.append(f"~ ATR {atr_pct:.1f}% — aceptable")
+            reasoning.append(("~ ATR {:.1f}% — aceptable", atr_pct))
         else:
-            reasoning.append(f"✗ ATR {atr_pct:.1f}% — {'muy volátil' if atr_pct > 8 else 'muy bajo'}")
+            reasoning.append(("✗ ATR {:.1f}% — {}", atr_pct, "muy volátil" if atr_pct > 8 else "muy bajo"))
     else:
         reasoning.append("✗ Sin datos de ATR")
 
-    return {
-        "style": "turtles_minervini",
-        "score": min(score, 25),
-        "max_score": 25,
-        "reasoning": reasoning,
-        "signals": {
-            "breakout": price > high_20d,
-            "volume_confirmed": volume_ratio > 1.5,
-            "volume_ratio": round(volume_ratio, 2),
-            "atr_pct": round(atr / price * 100, 2) if price > 0 and atr > 0 else 0,
-            "rs_vs_spy": round(
-                ((price - price_60d_ago) / price_60d_ago) / ((spy_price - spy_price_60d_ago) / spy_price_60d_ago), 2
-            ) if all(x > 0 for x in [price_60d_ago, spy_price_60d_ago, spy_price]) else None
+    return reasoning
+
+
+def _empty_result(reason: str) -> ScoreResult:
+    return ScoreResult(
+        style="turtles_minervini",
+        score=0,
+        max_score=25,
+        reasoning=[f"✗ {reason}"],
+        signals={
+            "breakout": False, "volume_confirmed": False, "volume_ratio": 0,
+            "atr_pct": 0, "rs_vs_spy": None
         }
-    }
+    )
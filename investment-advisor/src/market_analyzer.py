@@ -9,27 +9,143 @@ import os
 import json
 import time
 import random
+import heapq
+import importlib.util
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from typing import Optional
 import sys
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
-
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+
+# edgartools arrastra pandas/pyarrow/httpx y tarda en importarse; solo se usa en
+# _enrich_with_edgar cuando hay candidatos, así que aquí solo se comprueba que está
+# instalado y el import se hace allí
+_EDGAR_AVAILABLE = importlib.util.find_spec("edgar") is not None
+
+# orjson parsea los bytes de la respuesta directamente (sin decodificar a str) y es
+# varias veces más rápido que json en los ~200 días de histórico de cada quote.
+# Todas las respuestas JSON (Yahoo y Finnhub) se parsean con _json_loads
 try:
-    from edgar import Company as EdgarCompany, set_identity as edgar_set_identity
-    _EDGAR_AVAILABLE = True
+    import orjson
+    _ORJSON_AVAILABLE = True
+    _json_loads = orjson.loads
 except ImportError:
-    _EDGAR_AVAILABLE = False
+    _ORJSON_AVAILABLE = False
+    _json_loads = json.loads
+
+
+def _json_dumps(obj) -> bytes:
+    """
+    JSON indentado (2 espacios) en bytes UTF-8; lo no serializable se escribe con str().
+
+    El texto no ASCII (acentos, "—", "↑" del reasoning) se escribe tal cual en UTF-8,
+    también sin orjson (ensure_ascii=False). Diferencias con el antiguo json.dump:
+    con orjson NaN/Infinity se escriben como null y algunos floats pequeños salen sin
+    exponente (1e-05 → 0.00001). El valor numérico es el mismo.
+    """
+    if _ORJSON_AVAILABLE:
+        return orjson.dumps(
+            obj, default=str,
+            option=(orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                    | orjson.OPT_PASSTHROUGH_DATETIME)
+        )
+    return json.dumps(obj, indent=2, default=str, ensure_ascii=False).encode("utf-8")
 
 # Importar el comité virtual (longs y shorts)
 from committee import evaluate_opportunity, evaluate_short_opportunity
+from committee.cache import DiskCache, cached, fingerprint
+from committee._njit import NUMBA_AVAILABLE, njit
+
+# Cache en disco de evaluaciones del comité (TTL 60s), solo con COMMITTEE_DISK_CACHE=1:
+# sirve para scans intradía repetidos en local, donde muchos tickers llegan con los
+# mismos datos. En CI los scans van separados por horas y cache/committee no se
+# conserva entre ejecuciones, así que solo pagaría el hash y el pickle de cada ticker
+COMMITTEE_CACHE_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cache", "committee"))
+if os.getenv("COMMITTEE_DISK_CACHE") == "1":
+    committee_cache = DiskCache(COMMITTEE_CACHE_DIR)
+    evaluate_opportunity_cached = cached(ttl=60, backend=committee_cache)(evaluate_opportunity)
+else:
+    committee_cache = None
+    evaluate_opportunity_cached = evaluate_opportunity
+
+# Cache en disco de respuestas HTTP (JSON), TTL por endpoint: un segundo scan del
+# mismo día no repite las peticiones de datos que aún no han caducado
+HTTP_CACHE_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cache", "http"))
+http_cache = DiskCache(HTTP_CACHE_DIR)
+HTTP_CACHE_TTL = {
+    "quote": 300,        # 5 min
+    "details": 3600,     # 1 h
+    "profile": 86400,    # 24 h: el perfil de la empresa (market cap, beta) apenas cambia
+    "earnings": 21600,   # 6 h
+    "news": 3600,        # 1 h
+}
+
+
+def _raw(section: dict, key: str):
+    """Valor de un campo de Yahoo quoteSummary ({"raw": ..., "fmt": ...} o valor plano)"""
+    value = section.get(key)
+    if isinstance(value, dict):
+        return value.get("raw")
+    return value
+
+
+@lru_cache(maxsize=64)
+def _parse_date(date_str: str) -> datetime:
+    """
+    Fecha YYYY-MM-DD memoizada: las fechas de earnings se repiten mucho (temporada de
+    resultados). fromisoformat es varias veces más rápido que strptime en los fallos de cache.
+    """
+    return datetime.fromisoformat(date_str)
+
+
+# ============================================================================
+# KERNELS DE INDICADORES (recurrencias EMA / RMA compiladas con numba si está)
+# ============================================================================
+
+@njit(cache=True)
+def _ema_loop(values, alpha, seed):
+    """Último valor de s = s + alpha * (x - s) sobre values, partiendo de seed"""
+    out = seed
+    for x in values:
+        out = (x - out) * alpha + out
+    return out
+
+
+def _ema_weighted(values, alpha, seed):
+    """Mismo resultado que _ema_loop, vectorizado con numpy"""
+    # La recurrencia desenrollada es una suma ponderada:
+    # (1-alpha)^n * seed + alpha * sum((1-alpha)^j * x[-1-j])
+    decay = (1.0 - alpha) ** np.arange(len(values) + 1, dtype=np.float64)
+    return decay[-1] * seed + alpha * np.dot(decay[:-1], values[::-1])
+
+
+# Sin numba, _ema_loop sería un bucle Python sobre un ndarray (más lento que sobre
+# una lista): en ese caso se usa la forma vectorizada
+_ema_last = _ema_loop if NUMBA_AVAILABLE else _ema_weighted
+
+
+def _wilder_rma(values, period):
+    """RMA de Wilder: semilla = media de los primeros 'period' valores, luego alpha = 1/period"""
+    seed = values[:period].mean()
+    return _ema_last(values[period:], 1.0 / period, seed)
+
 
 # ============================================================================
 # CONFIGURACION
 # ============================================================================
 
+# Tramos de market cap para el volumen mínimo: small < $1B <= mid < $10B <= large
+VOLUME_CAP_CEILINGS = (1e9, 10e9, float("inf"))
+VOLUME_CAP_LABELS = ("small", "mid", "large")
+
 @dataclass
 class TradingConfig:
     """Parametros de trading configurables - PROFESIONAL SWING TRADING"""
@@ -60,11 +176,16 @@ class TradingConfig:
     volume_thresholds: dict = None
 
     def __post_init__(self):
-        self.volume_thresholds = {
-            "small": 1_000_000,   # $100M-$1B: 1M shares minimo
-            "mid": 750_000,       # $1B-$10B: 750K shares
-            "large": 500_000      # >$10B: 500K shares
-        }
+        if self.volume_thresholds is None:
+            self.volume_thresholds = {
+                "small": 1_000_000,   # $100M-$1B: 1M shares minimo
+                "mid": 750_000,       # $1B-$10B: 750K shares
+                "large": 500_000      # >$10B: 500K shares
+            }
+        # (label, volumen mínimo) alineado con VOLUME_CAP_CEILINGS para lookup con bisect
+        self.volume_brackets = tuple(
+            (label, self.volume_thresholds[label]) for label in VOLUME_CAP_LABELS
+        )
 
 def load_trading_config() -> TradingConfig:
     """Carga parámetros desde trading_config.json; fallback a defaults si no existe."""
@@ -92,13 +213,12 @@ def load_trading_config() -> TradingConfig:
             min_price=float(filters.get("min_price_usd", 2.0)),
             max_price=float(filters.get("max_price_usd", 500.0)),
             max_spread_pct=float(filters.get("max_spread_pct", 1.0)),
-        )
-        if vol:
-            cfg.volume_thresholds = {
+            volume_thresholds={
                 "small": int(vol.get("small_cap_300M_1B", 1_000_000)),
                 "mid": int(vol.get("mid_cap_1B_5B", 750_000)),
                 "large": int(vol.get("large_cap_above_5B", 500_000)),
-            }
+            } if vol else None,
+        )
         print(f"[CONFIG] Cargado trading_config.json — stop_loss={cfg.max_stop_loss_pct}%, "
               f"min_price=${cfg.min_price}, min_cap=${cfg.min_market_cap/1e6:.0f}M")
         return cfg
@@ -116,11 +236,81 @@ config = load_trading_config()
 class MarketDataAPI:
     """Wrapper para APIs de datos financieros gratuitas"""
 
+    # Endpoints y cabeceras de Yahoo, construidos una vez (no en cada fetch).
+    # requests ya negocia gzip por defecto; se declara explícito porque el chart de
+    # 200 días comprime ~5x y es la respuesta más pesada del scan.
+    _YAHOO_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{}"
+    _YAHOO_CHART_PARAMS = {"interval": "1d", "range": "200d"}
+    _YAHOO_SUMMARY_URL = "https://query1.finance.yahoo.com/v10/finance/quoteSummary/{}"
+    _YAHOO_SUMMARY_PARAMS = {"modules": "summaryDetail,defaultKeyStatistics,financialData"}
+    # Campos que aporta _fetch_yahoo_details: (campo del quote, módulo de quoteSummary, clave)
+    _YAHOO_SUMMARY_FIELDS = (
+        ("market_cap", "summaryDetail", "marketCap"),
+        ("beta", "summaryDetail", "beta"),
+        ("volume", "summaryDetail", "volume"),
+        ("avg_volume", "summaryDetail", "averageVolume"),
+        ("52w_high", "summaryDetail", "fiftyTwoWeekHigh"),
+        ("52w_low", "summaryDetail", "fiftyTwoWeekLow"),
+        ("pe_ratio", "summaryDetail", "trailingPE"),
+        ("short_ratio", "defaultKeyStatistics", "shortRatio"),
+        ("short_pct", "defaultKeyStatistics", "shortPercentOfFloat"),
+        ("revenue_growth", "financialData", "revenueGrowth"),
+        ("profit_margin", "financialData", "profitMargins"),
+    )
+    _YAHOO_HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+        "Accept": "application/json",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Accept-Encoding": "gzip, deflate"
+    }
+
+    _FINNHUB_PROFILE_URL = "https://finnhub.io/api/v1/stock/profile2"
+    _FINNHUB_METRIC_URL = "https://finnhub.io/api/v1/stock/metric"
+    # (campo del quote, clave de /stock/metric) que copia _fetch_finnhub_details
+    _FINNHUB_METRIC_FIELDS = (
+        ("52w_high", "52WeekHigh"),
+        ("52w_low", "52WeekLow"),
+        ("pe_ratio", "peBasicExclExtraTTM"),
+        ("revenue_growth", "revenueGrowthTTMYoy"),
+        ("profit_margin", "netProfitMarginTTM"),
+    )
+
     def __init__(self):
         self.finnhub_key = os.getenv("FINNHUB_API_KEY", "")
         self.alpha_vantage_key = os.getenv("ALPHA_VANTAGE_KEY", "")
         self.fmp_key = os.getenv("FMP_API_KEY", "")
 
+        # Una sesión compartida por todos los hilos del scan: reutiliza conexiones
+        # TCP/TLS por host en lugar de abrir una nueva en cada petición.
+        # Se reintentan fallos de conexión y errores 5xx transitorios; 429 y timeouts
+        # los gestiona cada fetch (backoff propio), así que no se reintentan aquí.
+        self.session = requests.Session()
+        retry = Retry(connect=2, read=0, status=2, status_forcelist=(500, 502, 503, 504),
+                      backoff_factor=0.3, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _get_json(self, endpoint: str, url: str, params: dict, **kwargs) -> tuple:
+        """
+        session.get con cache en disco de las respuestas 200 (TTL de HTTP_CACHE_TTL[endpoint]).
+
+        Retorna (status_code, json). Las respuestas de error no se cachean y la API key
+        (param "token") no forma parte de la clave.
+        """
+        key = fingerprint(endpoint, url, {k: v for k, v in params.items() if k != "token"})
+        hit, data = http_cache.get(key)
+        if hit:
+            return 200, data
+
+        response = self.session.get(url, params=params, proxies={"http": None, "https": None}, **kwargs)
+        if response.status_code != 200:
+            return response.status_code, None
+
+        data = _json_loads(response.content)
+        http_cache.set(key, data, HTTP_CACHE_TTL[endpoint])
+        return 200, data
+
     def get_market_status(self) -> dict:
         """Obtiene estado general del mercado"""
         result = {
@@ -134,13 +324,15 @@ class MarketDataAPI:
         }
 
         try:
-            # VIX via Yahoo Finance (sin API key)
-            vix_data = self._fetch_yahoo_quote("^VIX")
+            # VIX, SPY y Nasdaq via Yahoo Finance (sin API key), en paralelo
+            quotes = self._fetch_yahoo_quotes(["^VIX", "SPY", "^IXIC"])
+
+            vix_data = quotes["^VIX"]
             if vix_data:
                 result["vix"] = vix_data.get("price")
 
             # S&P 500 (SPY como proxy)
-            spy_data = self._fetch_yahoo_quote("SPY")
+            spy_data = quotes["SPY"]
             if spy_data:
                 result["sp500_change"] = spy_data.get("change_pct")
                 # Verificar si SPY está sobre su EMA 200
@@ -153,7 +345,7 @@ class MarketDataAPI:
                 result["spy_price_60d_ago"] = spy_data.get("price_60d_ago", spy_price)
 
             # Nasdaq
-            nasdaq_data = self._fetch_yahoo_quote("^IXIC")
+            nasdaq_data = quotes["^IXIC"]
             if nasdaq_data:
                 result["nasdaq_change"] = nasdaq_data.get("change_pct")
 
@@ -165,6 +357,11 @@ class MarketDataAPI:
 
         return result
 
+    def _fetch_yahoo_quotes(self, symbols: list, max_workers: int = 16) -> dict:
+        """_fetch_yahoo_quote para varios símbolos a la vez. Retorna {symbol: quote o None}"""
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols)) or 1) as executor:
+            return dict(zip(symbols, executor.map(self._fetch_yahoo_quote, symbols)))
+
     def _fetch_finnhub_quote(self, symbol: str) -> Optional[dict]:
         """Fetch quote and historical candle data from Finnhub (primary source)"""
         if not self.finnhub_key:
@@ -173,12 +370,12 @@ class MarketDataAPI:
         try:
             url = "https://finnhub.io/api/v1/quote"
             params = {"symbol": symbol, "token": self.finnhub_key}
-            response = requests.get(url, params=params, timeout=10, proxies={"http": None, "https": None})
+            response = self.session.get(url, params=params, timeout=10, proxies={"http": None, "https": None})
 
             if response.status_code != 200:
                 return None
 
-            data = response.json()
+            data = _json_loads(response.content)
             price = data.get("c", 0)
             prev_close = data.get("pc", 0)
 
@@ -199,11 +396,11 @@ class MarketDataAPI:
                 "to": to_ts,
                 "token": self.finnhub_key
             }
-            candle_response = requests.get(candle_url, params=candle_params, timeout=15, proxies={"http": None, "https": None})
+            candle_response = self.session.get(candle_url, params=candle_params, timeout=15, proxies={"http": None, "https": None})
 
             closes, highs, lows, volumes = [], [], [], []
             if candle_response.status_code == 200:
-                candle_data = candle_response.json()
+                candle_data = _json_loads(candle_response.content)
                 if candle_data.get("s") == "ok":
                     closes = candle_data.get("c", [])[-200:]
                     highs = candle_data.get("h", [])[-200:]
@@ -230,20 +427,15 @@ class MarketDataAPI:
 
     def _fetch_yahoo_quote(self, symbol: str) -> Optional[dict]:
         """Fetch quote from Yahoo Finance with historical data for technical indicators"""
-        url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
-        params = {"interval": "1d", "range": "200d"}
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Accept": "application/json",
-            "Accept-Language": "en-US,en;q=0.9"
-        }
+        url = self._YAHOO_CHART_URL.format(symbol)
 
         for attempt in range(3):
             try:
-                response = requests.get(url, params=params, headers=headers, timeout=15, proxies={'http': None, 'https': None})
+                status_code, data = self._get_json(
+                    "quote", url, self._YAHOO_CHART_PARAMS, headers=self._YAHOO_HEADERS, timeout=15
+                )
 
-                if response.status_code == 200:
-                    data = response.json()
+                if status_code == 200:
                     chart_result = data.get("chart", {}).get("result")
 
                     if not chart_result or len(chart_result) == 0:
@@ -263,17 +455,8 @@ class MarketDataAPI:
                     else:
                         change_pct = 0
 
-                    # Extraer precios de cierre históricos
-                    closes = indicators.get("close", [])
-                    highs = indicators.get("high", [])
-                    lows = indicators.get("low", [])
-                    volumes = indicators.get("volume", [])
-
-                    # Filtrar None values
-                    closes = [c for c in closes if c is not None]
-                    highs = [h for h in highs if h is not None]
-                    lows = [l for l in lows if l is not None]
-                    volumes = [v for v in volumes if v is not None]
+                    # Extraer series históricas alineadas (sin barras incompletas)
+                    closes, highs, lows, volumes = self._aligned_ohlcv(indicators)
 
                     # Calcular indicadores técnicos
                     technical_indicators = self._calculate_technical_indicators(closes, highs, lows, volumes)
@@ -283,19 +466,19 @@ class MarketDataAPI:
                         "price": round(price, 2) if price else 0,
                         "prev_close": round(prev_close, 2) if prev_close else 0,
                         "change_pct": round(change_pct, 2),
-                        "_closes_raw": closes  # Para cálculos de RS vs SPY
+                        "_closes_raw": closes.tolist()  # Para cálculos de RS vs SPY
                     }
 
                     # Agregar indicadores técnicos
                     quote.update(technical_indicators)
                     return quote
 
-                elif response.status_code == 429:
+                elif status_code == 429:
                     wait = 2 ** (attempt + 1)
                     print(f"[WARN] Rate limited on {symbol}, waiting {wait}s (attempt {attempt+1}/3)")
                     time.sleep(wait)
                 else:
-                    print(f"[WARN] Yahoo API returned {response.status_code} for {symbol}")
+                    print(f"[WARN] Yahoo API returned {status_code} for {symbol}")
                     return None
 
             except requests.exceptions.Timeout:
@@ -309,130 +492,147 @@ class MarketDataAPI:
 
         return None
 
-    def _calculate_technical_indicators(self, closes: list, highs: list, lows: list, volumes: list) -> dict:
-        """Calcula indicadores técnicos necesarios para el comité"""
-        if not closes or len(closes) < 20:
+    @staticmethod
+    def _aligned_ohlcv(quote_indicators: dict) -> tuple:
+        """
+        Convierte las series close/high/low/volume de Yahoo a arrays float64 y descarta
+        las barras en las que falte cualquiera de ellas (None → NaN).
+
+        Una única máscara compartida mantiene las series alineadas barra a barra,
+        que es lo que asume el cálculo del true range del ATR.
+        """
+        series = [
+            np.array(quote_indicators.get(key) or [], dtype=np.float64)
+            for key in ("close", "high", "low", "volume")
+        ]
+        n = min(len(arr) for arr in series)
+        series = [arr[:n] for arr in series]
+
+        mask = np.isfinite(series[0])
+        for arr in series[1:]:
+            mask &= np.isfinite(arr)
+
+        return tuple(arr[mask] for arr in series)
+
+    def _calculate_technical_indicators(self, closes, highs, lows, volumes) -> dict:
+        """Calcula indicadores técnicos necesarios para el comité (acepta listas o arrays)"""
+        if len(closes) < 20:
             return {}
 
+        # Una sola conversión a arrays float64; todos los indicadores trabajan sobre ellos
+        c = np.asarray(closes, dtype=np.float64)
+        h = np.asarray(highs, dtype=np.float64)
+        l = np.asarray(lows, dtype=np.float64)
+        v = np.asarray(volumes, dtype=np.float64)
+
         indicators = {}
 
         # High de 20 días
-        if len(highs) >= 20:
-            indicators["high_20d"] = max(highs[-20:])
+        if len(h) >= 20:
+            indicators["high_20d"] = float(h[-20:].max())
 
         # Precios históricos para momentum y parabolic detection
-        if len(closes) >= 6:
-            indicators["price_5d_ago"] = closes[-6]
-        if len(closes) >= 11:
-            indicators["price_10d_ago"] = closes[-11]
-        if len(closes) >= 21:
-            indicators["price_20d_ago"] = closes[-21]
-        if len(closes) >= 61:
-            indicators["price_60d_ago"] = closes[-61]
+        if len(c) >= 6:
+            indicators["price_5d_ago"] = float(c[-6])
+        if len(c) >= 11:
+            indicators["price_10d_ago"] = float(c[-11])
+        if len(c) >= 21:
+            indicators["price_20d_ago"] = float(c[-21])
+        if len(c) >= 61:
+            indicators["price_60d_ago"] = float(c[-61])
 
         # Volumen promedio de 20 días
-        if len(volumes) >= 20:
-            indicators["avg_volume_20d"] = sum(volumes[-20:]) / 20
-            indicators["volume"] = volumes[-1] if volumes else 0
+        if len(v) >= 20:
+            indicators["avg_volume_20d"] = float(v[-20:].mean())
+            indicators["volume"] = int(v[-1])
 
         # EMA 20
-        if len(closes) >= 20:
-            indicators["ema_20"] = self._calculate_ema(closes, 20)
+        if len(c) >= 20:
+            indicators["ema_20"] = self._calculate_ema(c, 20)
 
         # EMA 50
-        if len(closes) >= 50:
-            indicators["ema_50"] = self._calculate_ema(closes, 50)
+        if len(c) >= 50:
+            indicators["ema_50"] = self._calculate_ema(c, 50)
 
         # EMA 200
-        if len(closes) >= 200:
-            indicators["ema_200"] = self._calculate_ema(closes, 200)
+        if len(c) >= 200:
+            indicators["ema_200"] = self._calculate_ema(c, 200)
 
         # SMA 150 (Weinstein 30-week MA) — distingue Stage 2 de Stage 4
-        if len(closes) >= 150:
-            indicators["sma_150"] = self._calculate_sma(closes, 150)
+        if len(c) >= 150:
+            indicators["sma_150"] = self._calculate_sma(c, 150)
             # SMA 150 de hace 20 días para detectar dirección (rising/declining)
-            if len(closes) >= 170:
-                indicators["sma_150_20d_ago"] = self._calculate_sma(closes[:-20], 150)
+            if len(c) >= 170:
+                indicators["sma_150_20d_ago"] = self._calculate_sma(c[:-20], 150)
 
         # ATR 14
-        if len(closes) >= 14 and len(highs) >= 14 and len(lows) >= 14:
-            indicators["atr_14"] = self._calculate_atr(closes, highs, lows, 14)
+        if len(c) >= 14 and len(h) >= 14 and len(l) >= 14:
+            indicators["atr_14"] = self._calculate_atr(c, h, l, 14)
 
         # RSI 14 — para detección parabólica (RSI > 80 = overbought extremo)
-        if len(closes) >= 15:
-            indicators["rsi_14"] = self._calculate_rsi(closes, 14)
+        if len(c) >= 15:
+            indicators["rsi_14"] = self._calculate_rsi(c, 14)
 
         return indicators
 
-    def _calculate_sma(self, prices: list, period: int) -> float:
+    def _calculate_sma(self, prices: np.ndarray, period: int) -> float:
         """Calcula SMA (Simple Moving Average)"""
         if len(prices) < period:
             return 0
-        return round(sum(prices[-period:]) / period, 2)
+        return round(float(prices[-period:].mean()), 2)
 
-    def _calculate_rsi(self, closes: list, period: int = 14) -> float:
+    def _calculate_rsi(self, closes: np.ndarray, period: int = 14) -> float:
         """Calcula RSI (Relative Strength Index)"""
         if len(closes) < period + 1:
             return 50.0
-        deltas = [closes[i] - closes[i-1] for i in range(1, len(closes))]
-        recent = deltas[-(period + 1):]
-        gains = [max(d, 0) for d in recent]
-        losses = [max(-d, 0) for d in recent]
-        avg_gain = sum(gains[-period:]) / period
-        avg_loss = sum(losses[-period:]) / period
+        deltas = np.diff(closes[-(period + 1):])
+        avg_gain = np.maximum(deltas, 0).sum() / period
+        avg_loss = np.maximum(-deltas, 0).sum() / period
         if avg_loss == 0:
             return 100.0
         rs = avg_gain / avg_loss
-        return round(100 - (100 / (1 + rs)), 2)
+        return round(float(100 - (100 / (1 + rs))), 2)
 
-    def _calculate_ema(self, prices: list, period: int) -> float:
+    def _calculate_ema(self, prices: np.ndarray, period: int) -> float:
         """Calcula EMA (Exponential Moving Average)"""
         if len(prices) < period:
             return 0
 
         # Multiplier: 2 / (period + 1)
-        multiplier = 2.0 / (period + 1)
+        alpha = 2.0 / (period + 1)
 
         # Inicializar EMA con SMA del primer periodo
-        sma = sum(prices[:period]) / period
-        ema = sma
+        seed = prices[:period].mean()
+        ema = _ema_last(prices[period:], alpha, seed)
 
-        # Calcular EMA para el resto
-        for price in prices[period:]:
-            ema = (price - ema) * multiplier + ema
+        return round(float(ema), 2)
 
-        return round(ema, 2)
-
-    def _calculate_atr(self, closes: list, highs: list, lows: list, period: int = 14) -> float:
-        """Calcula ATR (Average True Range)"""
+    def _calculate_atr(self, closes: np.ndarray, highs: np.ndarray, lows: np.ndarray, period: int = 14) -> float:
+        """Calcula ATR (Average True Range) con el suavizado RMA de Wilder"""
         if len(closes) < period + 1 or len(highs) < period or len(lows) < period:
             return 0
 
-        true_ranges = []
-        for i in range(1, len(closes)):
-            high = highs[i]
-            low = lows[i]
-            prev_close = closes[i-1]
+        n = len(closes)
+        high = highs[1:n]
+        low = lows[1:n]
+        prev_close = closes[:n - 1]
 
-            tr = max(
-                high - low,
-                abs(high - prev_close),
-                abs(low - prev_close)
-            )
-            true_ranges.append(tr)
+        # TR = max(H-L, |H-Cprev|, |L-Cprev|) para todas las barras a la vez
+        true_ranges = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
 
-        # ATR es el promedio de los últimos 'period' true ranges
-        if len(true_ranges) >= period:
-            atr = sum(true_ranges[-period:]) / period
-            return round(atr, 2)
-
-        return 0
+        # Wilder: semilla = media de los primeros 'period' TR, después
+        # ATR = ATR_prev + (TR - ATR_prev) / period
+        atr = _wilder_rma(true_ranges, period)
+        return round(float(atr), 2)
 
     def _determine_regime(self, market_data: dict) -> str:
         """Determina el regimen de mercado actual"""
-        vix = market_data.get("vix")
-        sp500 = market_data.get("sp500_change")
+        return self._classify_regime(market_data.get("vix"), market_data.get("sp500_change"))
 
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _classify_regime(vix: Optional[float], sp500: Optional[float]) -> str:
+        """Régimen a partir de (VIX, cambio S&P 500): función pura, memoizada"""
         if vix is None:
             return "UNKNOWN"
 
@@ -494,43 +694,18 @@ class MarketDataAPI:
     def _fetch_yahoo_details(self, quote: dict, symbol: str) -> bool:
         """Obtiene datos adicionales de Yahoo Finance. Retorna True si tuvo exito."""
         try:
-            url = f"https://query1.finance.yahoo.com/v10/finance/quoteSummary/{symbol}"
-            params = {"modules": "summaryDetail,defaultKeyStatistics,financialData"}
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "application/json"
-            }
-
-            response = requests.get(url, params=params, headers=headers, timeout=15, proxies={'http': None, 'https': None})
-            if response.status_code == 200:
-                data = response.json()
+            url = self._YAHOO_SUMMARY_URL.format(symbol)
+            status_code, data = self._get_json(
+                "details", url, self._YAHOO_SUMMARY_PARAMS, headers=self._YAHOO_HEADERS, timeout=15
+            )
+            if status_code == 200:
                 quote_result = data.get("quoteSummary", {}).get("result")
 
                 if quote_result and len(quote_result) > 0:
                     result = quote_result[0]
-
-                    summary = result.get("summaryDetail", {})
-                    stats = result.get("defaultKeyStatistics", {})
-                    financials = result.get("financialData", {})
-
-                    def safe_get(d, key):
-                        val = d.get(key, {})
-                        if isinstance(val, dict):
-                            return val.get("raw")
-                        return val
-
                     quote.update({
-                        "market_cap": safe_get(summary, "marketCap"),
-                        "beta": safe_get(summary, "beta"),
-                        "volume": safe_get(summary, "volume"),
-                        "avg_volume": safe_get(summary, "averageVolume"),
-                        "52w_high": safe_get(summary, "fiftyTwoWeekHigh"),
-                        "52w_low": safe_get(summary, "fiftyTwoWeekLow"),
-                        "pe_ratio": safe_get(summary, "trailingPE"),
-                        "short_ratio": safe_get(stats, "shortRatio"),
-                        "short_pct": safe_get(stats, "shortPercentOfFloat"),
-                        "revenue_growth": safe_get(financials, "revenueGrowth"),
-                        "profit_margin": safe_get(financials, "profitMargins"),
+                        field: _raw(result.get(module) or {}, key)
+                        for field, module, key in self._YAHOO_SUMMARY_FIELDS
                     })
 
                     # Verificar si obtuvimos datos utiles
@@ -549,31 +724,23 @@ class MarketDataAPI:
 
         try:
             # Obtener perfil de la empresa (market cap)
-            url = f"https://finnhub.io/api/v1/stock/profile2"
             params = {"symbol": symbol, "token": self.finnhub_key}
-            response = requests.get(url, params=params, timeout=10)
+            status_code, data = self._get_json("profile", self._FINNHUB_PROFILE_URL, params, timeout=10)
 
-            if response.status_code == 200:
-                data = response.json()
-                if data:
-                    quote["market_cap"] = data.get("marketCapitalization", 0) * 1e6  # Finnhub da en millones
-                    quote["beta"] = data.get("beta")
+            if status_code == 200 and data:
+                quote["market_cap"] = data.get("marketCapitalization", 0) * 1e6  # Finnhub da en millones
+                quote["beta"] = data.get("beta")
 
             # Obtener metricas basicas
-            url = f"https://finnhub.io/api/v1/stock/metric"
-            params = {"symbol": symbol, "metric": "all", "token": self.finnhub_key}
-            response = requests.get(url, params=params, timeout=10)
+            params["metric"] = "all"
+            status_code, data = self._get_json("details", self._FINNHUB_METRIC_URL, params, timeout=10)
 
-            if response.status_code == 200:
-                data = response.json()
+            if status_code == 200:
                 metrics = data.get("metric", {})
                 if metrics:
-                    quote["52w_high"] = metrics.get("52WeekHigh")
-                    quote["52w_low"] = metrics.get("52WeekLow")
+                    for quote_key, metric_key in self._FINNHUB_METRIC_FIELDS:
+                        quote[quote_key] = metrics.get(metric_key)
                     quote["beta"] = quote.get("beta") or metrics.get("beta")
-                    quote["pe_ratio"] = metrics.get("peBasicExclExtraTTM")
-                    quote["revenue_growth"] = metrics.get("revenueGrowthTTMYoy")
-                    quote["profit_margin"] = metrics.get("netProfitMarginTTM")
                     if quote.get("revenue_growth"):
                         quote["revenue_growth"] = quote["revenue_growth"] / 100  # Convertir a decimal
 
@@ -605,12 +772,12 @@ class MarketDataAPI:
         try:
             url = "https://finnhub.io/api/v1/stock/earnings"
             params = {"symbol": symbol, "limit": 4, "token": self.finnhub_key}
-            response = requests.get(url, params=params, timeout=10, proxies={"http": None, "https": None})
+            response = self.session.get(url, params=params, timeout=10, proxies={"http": None, "https": None})
 
             if response.status_code != 200:
                 return result
 
-            data = response.json()
+            data = _json_loads(response.content)
             if not data:
                 return result
 
@@ -629,7 +796,7 @@ class MarketDataAPI:
             # Días desde earnings
             if period:
                 try:
-                    earnings_date = datetime.strptime(period, "%Y-%m-%d")
+                    earnings_date = _parse_date(period)
                     result["days_since_earnings"] = max(0, (datetime.now() - earnings_date).days)
                 except Exception:
                     pass
@@ -657,9 +824,8 @@ class MarketDataAPI:
                     "token": self.finnhub_key
                 }
 
-                response = requests.get(url, params=params, timeout=10, proxies={'http': None, 'https': None})
-                if response.status_code == 200:
-                    data = response.json()
+                status_code, data = self._get_json("earnings", url, params, timeout=10)
+                if status_code == 200:
                     earnings = data.get("earningsCalendar", [])
 
             except Exception as e:
@@ -693,9 +859,9 @@ class MarketDataAPI:
         try:
             url = "https://finnhub.io/api/v1/stock/insider-transactions"
             params = {"symbol": symbol, "token": self.finnhub_key}
-            response = requests.get(url, params=params, timeout=10, proxies={"http": None, "https": None})
+            response = self.session.get(url, params=params, timeout=10, proxies={"http": None, "https": None})
             if response.status_code == 200:
-                transactions = response.json().get("data", []) or []
+                transactions = _json_loads(response.content).get("data", []) or []
                 recent = [t for t in transactions if (t.get("filingDate") or "") >= cutoff]
                 buys = [t for t in recent if (t.get("change") or 0) > 0]
                 sells = [t for t in recent if (t.get("change") or 0) < 0]
@@ -716,9 +882,9 @@ class MarketDataAPI:
                 "to": today.strftime("%Y-%m-%d"),
                 "token": self.finnhub_key,
             }
-            response = requests.get(url, params=params, timeout=10, proxies={"http": None, "https": None})
+            response = self.session.get(url, params=params, timeout=10, proxies={"http": None, "https": None})
             if response.status_code == 200:
-                entries = response.json().get("data", []) or []
+                entries = _json_loads(response.content).get("data", []) or []
                 if entries:
                     result["insider_mspr"] = entries[-1].get("mspr")  # mes más reciente
         except Exception as e:
@@ -736,10 +902,16 @@ class MarketDataAPI:
         try:
             url = "https://finnhub.io/api/v1/news-sentiment"
             params = {"symbol": symbol, "token": self.finnhub_key}
-            response = requests.get(url, params=params, timeout=10, proxies={"http": None, "https": None})
 
-            if response.status_code == 200:
-                data = response.json()
+            # Free tier: 60 req/min. Un 429 se reintenta con backoff (como _fetch_yahoo_quote)
+            # en lugar de perder el sentimiento del ticker
+            for attempt in range(3):
+                status_code, data = self._get_json("news", url, params, timeout=10)
+                if status_code != 429 or attempt == 2:
+                    break
+                time.sleep(2 ** (attempt + 1))
+
+            if status_code == 200:
                 buzz = data.get("buzz", {}) or {}
                 sent = data.get("sentiment", {}) or {}
                 bullish = float(sent.get("bullishPercent") or 0)
@@ -749,6 +921,8 @@ class MarketDataAPI:
                 sentiment["bearish_pct"] = round(bearish, 3)
                 # Net: +1.0 = totalmente alcista, -1.0 = totalmente bajista
                 sentiment["score"] = round(bullish - bearish, 3)
+            elif status_code == 429:
+                print(f"[WARN] Finnhub news-sentiment rate limited for {symbol} after 3 attempts")
 
         except Exception as e:
             print(f"[WARN] Finnhub news-sentiment failed for {symbol}: {e}")
@@ -773,7 +947,7 @@ class OpportunityScorer:
         if stock_data is None:
             stock_data = self.api.get_stock_data(symbol, self.market_status)
         if not stock_data:
-            return {"symbol": symbol, "score": 0, "error": "No se pudo obtener datos"}
+            return {"symbol": symbol, "total_score": 0, "signal": "SKIP", "error": "No se pudo obtener datos"}
 
         # Verificar filtros de exclusión básicos primero
         exclusion_reason = self._check_exclusions(stock_data)
@@ -791,7 +965,7 @@ class OpportunityScorer:
             }
 
         # Llamar al comité virtual para evaluar
-        evaluation = evaluate_opportunity(
+        evaluation = evaluate_opportunity_cached(
             ticker=symbol,
             ticker_data=stock_data,
             market_data=self.market_status,
@@ -811,10 +985,10 @@ class OpportunityScorer:
             "signal": "COMPRA" if evaluation["decision"] == "BUY" else evaluation["decision"],
             "exclusion_reason": None if evaluation["decision"] in ["BUY", "WATCHLIST"] else evaluation["decision_reason"],
             "trade_setup": evaluation["trade_params"] if evaluation["decision"] == "BUY" else None,
-            # Nuevos campos del comité
+            # Nuevos campos del comité (SKIP/REJECT solo traen decision + score)
             "committee_evaluation": evaluation,
-            "breakdown": evaluation["breakdown"],
-            "reasoning": evaluation["reasoning"]
+            "breakdown": evaluation.get("breakdown", {}),
+            "reasoning": evaluation.get("reasoning", {})
         }
 
 
@@ -842,15 +1016,11 @@ class OpportunityScorer:
 
         # Verificar volumen segun market cap
         if market_cap and avg_volume:
-            if market_cap < 1e9:  # Small cap $100M-$1B
-                if avg_volume < config.volume_thresholds["small"]:
-                    return f"Volumen insuficiente para small cap ({avg_volume/1e6:.1f}M < {config.volume_thresholds['small']/1e6:.1f}M)"
-            elif market_cap < 10e9:  # Mid cap $1B-$10B
-                if avg_volume < config.volume_thresholds["mid"]:
-                    return f"Volumen insuficiente para mid cap"
-            else:  # Large cap >$10B
-                if avg_volume < config.volume_thresholds["large"]:
-                    return f"Volumen insuficiente para large cap"
+            label, min_volume = config.volume_brackets[bisect_right(VOLUME_CAP_CEILINGS, market_cap)]
+            if avg_volume < min_volume:
+                if label == "small":
+                    return f"Volumen insuficiente para small cap ({avg_volume/1e6:.1f}M < {min_volume/1e6:.1f}M)"
+                return f"Volumen insuficiente para {label} cap"
 
         return None
 
@@ -868,7 +1038,7 @@ class ShortOpportunityScorer:
         Recibe stock_data ya cargado (compartido con el scorer de longs).
         """
         if not stock_data:
-            return {"symbol": symbol, "score": 0, "error": "Sin datos"}
+            return {"symbol": symbol, "total_score": 0, "signal": "SKIP_SHORT", "error": "Sin datos"}
 
         # Filtros básicos para shorts: no shortear micro caps ilíquidas
         price = stock_data.get("price", 0)
@@ -919,25 +1089,25 @@ class MarketScanner:
     # =========================================================================
 
     # High-Growth Tech & AI
-    WATCHLIST_TECH_AI = [
+    WATCHLIST_TECH_AI = (
         "NVDA", "AMD", "SMCI", "ARM", "AVGO", "MRVL", "MU",  # Semiconductores AI
         "PLTR", "AI", "BBAI", "SOUN", "UPST",  # AI pure plays
         "PATH", "SNOW", "DDOG", "NET", "CRWD", "ZS",  # Cloud/Cyber
         "IONQ", "RGTI", "QUBT",  # Quantum computing
         "RKLB", "LUNR", "RDW",  # Space tech
-    ]
+    )
 
     # High-Beta Growth Stocks
-    WATCHLIST_HIGH_BETA = [
+    WATCHLIST_HIGH_BETA = (
         "TSLA", "RIVN", "LCID", "NIO", "XPEV", "LI",  # EV
         "COIN", "MSTR", "MARA", "RIOT", "CLSK", "HUT",  # Crypto-related
         "SHOP", "SQ", "AFRM", "SOFI", "HOOD", "NU",  # Fintech
         "ROKU", "TTD", "MGNI", "PUBM",  # AdTech
         "RBLX", "U", "TTWO", "EA",  # Gaming
-    ]
+    )
 
     # Small/Mid Caps con Momentum - Limpiado tickers muertos
-    WATCHLIST_SMALL_MID_CAPS = [
+    WATCHLIST_SMALL_MID_CAPS = (
         "APLD", "BTBT", "WULF", "CIFR", "IREN",  # Bitcoin miners
         "GEVO", "BE", "PLUG", "FCEL", "BLDP",  # Clean energy
         "JOBY", "ACHR", "LILM", "EVTL",  # eVTOL/Air taxis
@@ -946,64 +1116,70 @@ class MarketScanner:
         "XMTR", "PRNT", "NNDM", "SSYS",  # 3D Printing (VLD, DM delisted)
         "OPEN", "CVNA", "CARG", "CHPT",  # Real estate/auto/EV (RDFN delisted)
         "ASTS", "IRDM", "GSAT",  # Satellite/Space
-    ]
+    )
 
     # Biotech Especulativos (alto riesgo/alta recompensa) - Limpiado
-    WATCHLIST_BIOTECH_SPECULATIVE = [
+    WATCHLIST_BIOTECH_SPECULATIVE = (
         "MRNA", "BNTX", "NVAX",  # Vacunas
         "SAVA", "ACIU", "PRTA",  # Alzheimer
         "SRPT", "VRTX",  # Gene therapy (BLUE delisted)
         "IONS", "ALNY", "ARWR",  # RNA therapeutics
         "AXSM", "CPRX",  # CNS (SAGE issues)
         "PTGX", "KRYS", "IMVT", "MDGL",  # Small cap biotech (KRTX delisted)
-    ]
+    )
 
     # High Short Interest (potencial squeeze) - Limpiado tickers muertos
-    WATCHLIST_HIGH_SHORT = [
+    WATCHLIST_HIGH_SHORT = (
         "GME", "AMC", "KOSS",  # Meme classics (BBBY delisted)
         "BYND", "LMND",  # High short growth (CVNA/UPST ya en otra lista)
         "GOEV", "WKHS",  # EV shorts (FFIE, RIDE delisted)
         "SPCE", "LAZR",  # Tech shorts (VLDR delisted)
-    ]
+    )
 
     # IPOs Recientes y Growth Stories
-    WATCHLIST_RECENT_IPOS = [
+    WATCHLIST_RECENT_IPOS = (
         "RDDT", "DUOL", "CART", "TOST",  # Recent tech IPOs
         "KVYO", "BIRK", "ONON", "CAVA",  # Consumer
         "VRT", "INTA", "IOT",  # Enterprise
         "GRAB", "SE", "BABA", "JD", "PDD",  # Asian growth
-    ]
+    )
 
     # Principales europeas en eToro
-    WATCHLIST_EU = [
+    WATCHLIST_EU = (
         "ASML", "SAP", "NVO",  # Large caps
         "SPOT", "FVRR", "WIX",  # Tech EU/Israel
-    ]
+    )
 
     # =========================================================================
     # COMPILAR WATCHLIST COMPLETA
     # =========================================================================
 
-    DEFAULT_WATCHLIST_US = (
-        WATCHLIST_TECH_AI +
-        WATCHLIST_HIGH_BETA +
-        WATCHLIST_SMALL_MID_CAPS +
-        WATCHLIST_BIOTECH_SPECULATIVE +
-        WATCHLIST_HIGH_SHORT +
-        WATCHLIST_RECENT_IPOS
-    )
+    # dict.fromkeys conserva el orden y elimina los símbolos repetidos entre listas,
+    # para no analizar (ni pedir a las APIs) dos veces el mismo ticker
+    DEFAULT_WATCHLIST_US = tuple(dict.fromkeys(chain(
+        WATCHLIST_TECH_AI,
+        WATCHLIST_HIGH_BETA,
+        WATCHLIST_SMALL_MID_CAPS,
+        WATCHLIST_BIOTECH_SPECULATIVE,
+        WATCHLIST_HIGH_SHORT,
+        WATCHLIST_RECENT_IPOS,
+    )))
 
     DEFAULT_WATCHLIST_EU = WATCHLIST_EU
 
+    DEFAULT_WATCHLIST_ALL = tuple(dict.fromkeys(chain(DEFAULT_WATCHLIST_US, DEFAULT_WATCHLIST_EU)))
+
     def __init__(self):
         self.api = MarketDataAPI()
         self.scorer = None  # Se inicializa en scan_market con market_status
         self.earnings_calendar = {}  # Cache de earnings
+        self.scan_start = datetime.now()  # Se fija al inicio de cada scan_market
 
     def _load_earnings_calendar(self):
         """Carga el calendario de earnings para los proximos 14 dias"""
         print("  Cargando calendario de earnings...")
         earnings_list = self.api.get_earnings_calendar(days_ahead=14)
+        today = self.scan_start.date()
 
         for earning in earnings_list:
             symbol = earning.get("symbol", "")
@@ -1011,8 +1187,8 @@ class MarketScanner:
                 date_str = earning.get("date", "")
                 if date_str:
                     try:
-                        earning_date = datetime.strptime(date_str, "%Y-%m-%d")
-                        days_ahead = (earning_date - datetime.now()).days
+                        earning_date = _parse_date(date_str)
+                        days_ahead = (earning_date.date() - today).days
                         self.earnings_calendar[symbol] = {
                             "date": date_str,
                             "days_ahead": max(0, days_ahead),
@@ -1020,7 +1196,7 @@ class MarketScanner:
                             "eps_estimate": earning.get("epsEstimate"),
                             "revenue_estimate": earning.get("revenueEstimate")
                         }
-                    except:
+                    except (ValueError, TypeError):
                         pass
 
         print(f"  Earnings encontrados: {len(self.earnings_calendar)} acciones con earnings proximos")
@@ -1036,6 +1212,12 @@ class MarketScanner:
         if not _EDGAR_AVAILABLE or not candidates:
             return
 
+        try:
+            from edgar import Company as EdgarCompany, set_identity as edgar_set_identity
+        except ImportError as e:
+            print(f"[WARN] edgartools import failed: {e}")
+            return
+
         # Identificar al bot ante SEC EDGAR (requerimiento legal de sec.gov)
         user_agent = os.getenv("EDGAR_USER_AGENT", "investment-advisor-bot research@investment-advisor.local")
         try:
@@ -1051,7 +1233,7 @@ class MarketScanner:
             try:
                 company = EdgarCompany(symbol)
                 filings = company.get_filings(form="4").head(15)
-                cutoff = datetime.now() - timedelta(days=30)
+                cutoff = self.scan_start - timedelta(days=30)
 
                 buys, sells, buyer_names = 0, 0, set()
                 for filing in filings:
@@ -1125,9 +1307,15 @@ class MarketScanner:
         """Escanea el mercado en busca de oportunidades"""
 
         if watchlist is None:
-            watchlist = self.DEFAULT_WATCHLIST_US + self.DEFAULT_WATCHLIST_EU
-
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Iniciando scan de mercado...")
+            watchlist = self.DEFAULT_WATCHLIST_ALL
+
+        self.scan_start = datetime.now()
+        # Las claves del cache del comité dependen de los datos de cada ticker y las del
+        # cache HTTP de las fechas consultadas: las de scans anteriores ya no se leen
+        if committee_cache is not None:
+            committee_cache.prune()
+        http_cache.prune()
+        print(f"[{self.scan_start.strftime('%Y-%m-%d %H:%M:%S')}] Iniciando scan de mercado...")
         print(f"Analizando {len(watchlist)} acciones...")
 
         # 1. Estado del mercado
@@ -1151,7 +1339,6 @@ class MarketScanner:
         skipped = []
         short_opportunities = []
         short_watchlist = []
-        print_lock = threading.Lock()
 
         def scan_symbol(symbol: str) -> dict:
             time.sleep(random.uniform(0.3, 0.7))  # Distribuir requests para evitar rate limiting
@@ -1169,7 +1356,9 @@ class MarketScanner:
                 "short": result_short
             }
 
-        # 5 workers: balance velocidad / rate limiting Yahoo Finance + Finnhub
+        # 5 workers: balance velocidad / rate limiting Yahoo Finance + Finnhub.
+        # Los workers no imprimen el progreso: solo este hilo (as_completed) escribe en
+        # stdout, así que no hace falta lock y los workers nunca esperan por la consola
         with ThreadPoolExecutor(max_workers=5) as executor:
             futures = {executor.submit(scan_symbol, sym): sym for sym in watchlist}
             completed = 0
@@ -1184,16 +1373,15 @@ class MarketScanner:
 
                     # Procesar LONG
                     if not result.get("error"):
-                        score = result.get("total_score", 0)
-                        signal = result.get("signal", "SKIP")
+                        score = result["total_score"]
+                        signal = result["signal"]
                         catalyst_tag = f"[EARNINGS {catalyst_info['days_ahead']}d] " if catalyst_info else ""
-                        short_score = result_short.get("total_score", 0)
-                        short_signal = result_short.get("signal", "SKIP_SHORT")
+                        short_score = result_short["total_score"]
+                        short_signal = result_short["signal"]
                         short_tag = f"| SHORT:{short_score:.0f}" if short_score >= 40 else ""
 
-                        with print_lock:
-                            print(f"  [{completed}/{len(watchlist)}] {symbol} {catalyst_tag}"
-                                  f"L:{score:.0f}({signal}) {short_tag}")
+                        print(f"  [{completed}/{len(watchlist)}] {symbol} {catalyst_tag}"
+                              f"L:{score:.0f}({signal}) {short_tag}")
 
                         if signal == "COMPRA":
                             opportunities.append(result)
@@ -1203,7 +1391,7 @@ class MarketScanner:
                             skipped.append(result)
 
                     # Procesar SHORT
-                    short_sig = result_short.get("signal", "SKIP_SHORT")
+                    short_sig = result_short["signal"]
                     if short_sig == "SHORT":
                         short_opportunities.append(result_short)
                     elif short_sig == "WATCHLIST_SHORT":
@@ -1211,26 +1399,31 @@ class MarketScanner:
 
                 except Exception as e:
                     sym = futures[future]
-                    with print_lock:
-                        print(f"  {sym}: EXCEPCION: {e}")
+                    print(f"  {sym}: EXCEPCION: {e}")
 
-        # Ordenar por score
-        opportunities.sort(key=lambda x: x["total_score"], reverse=True)
-        watchlist_items.sort(key=lambda x: x["total_score"], reverse=True)
-        short_opportunities.sort(key=lambda x: x["total_score"], reverse=True)
-        short_watchlist.sort(key=lambda x: x["total_score"], reverse=True)
+        print()
+        if committee_cache is not None:
+            cache_stats = committee_cache.stats()
+            print(f"Cache comité: {cache_stats['hits']} hits / {cache_stats['misses']} misses")
+        http_stats = http_cache.stats()
+        print(f"Cache HTTP: {http_stats['hits']} hits / {http_stats['misses']} misses")
+
+        # Top N por score: nlargest es estable como sort+slice pero no ordena la lista
+        # entera; los contadores del resultado siguen usando las listas completas
+        by_score = itemgetter("total_score")
+        top_opportunities = heapq.nlargest(5, opportunities, key=by_score)
+        top_watchlist = heapq.nlargest(10, watchlist_items, key=by_score)
 
         # Enriquecer top candidatos con SEC EDGAR Form 4 (post-scan, solo shortlist)
-        top_candidates = opportunities[:5] + watchlist_items[:10]
-        self._enrich_with_edgar(top_candidates)
+        self._enrich_with_edgar(top_opportunities + top_watchlist)
 
         return {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self.scan_start.isoformat(),
             "market_status": market_status,
-            "opportunities": opportunities[:5],
-            "watchlist": watchlist_items[:10],
-            "short_opportunities": short_opportunities[:5],
-            "short_watchlist": short_watchlist[:10],
+            "opportunities": top_opportunities,
+            "watchlist": top_watchlist,
+            "short_opportunities": heapq.nlargest(5, short_opportunities, key=by_score),
+            "short_watchlist": heapq.nlargest(10, short_watchlist, key=by_score),
             "total_scanned": len(watchlist),
             "opportunities_found": len(opportunities),
             "watchlist_count": len(watchlist_items),
@@ -1326,8 +1519,7 @@ class MarketScanner:
             for component, reasons in reasoning.items():
                 if reasons:
                     lines.append(f"\n*{component.capitalize()}:*")
-                    for r in reasons:
-                        lines.append(f"  {r}")
+                    lines.extend(f"  {r}" for r in reasons)
 
         setup = opp.get("trade_setup")
         if setup:
@@ -1368,8 +1560,9 @@ class MarketScanner:
             lines.append(f"  Seykota (tendencia): {breakdown.get('seykota', 0)}/20")
             lines.append(f"  Catalizador: {breakdown.get('catalyst', 0)}/25")
             lines.append(f"  Risk/Reward: {breakdown.get('risk_reward', 0)}/15")
-            if breakdown.get('sector_adjustment', 0) != 0:
-                lines.append(f"  Ajuste sector: {breakdown.get('sector_adjustment', 0):+d}")
+            sector_adjustment = breakdown.get('sector_adjustment', 0)
+            if sector_adjustment != 0:
+                lines.append(f"  Ajuste sector: {sector_adjustment:+d}")
 
         # Reasoning detallado
         reasoning = opp.get("reasoning", {})
@@ -1378,10 +1571,8 @@ class MarketScanner:
 
             for component, reasons in reasoning.items():
                 if reasons:
-                    component_name = component.capitalize()
-                    lines.append(f"\n*{component_name}:*")
-                    for reason in reasons:
-                        lines.append(f"  {reason}")
+                    lines.append(f"\n*{component.capitalize()}:*")
+                    lines.extend(f"  {reason}" for reason in reasons)
 
         # Trade setup
         setup = opp.get("trade_setup")
@@ -1409,9 +1600,13 @@ def create_github_issue_body(scan_result: dict) -> tuple:
     shorts = scan_result.get("short_opportunities", [])
     has_any = bool(opps or shorts)
 
+    # Hora del scan (la misma en título y cuerpo), no la de generación del issue
+    timestamp = scan_result.get("timestamp")
+    scan_time = (datetime.fromisoformat(timestamp) if timestamp else datetime.now()).strftime('%Y-%m-%d %H:%M')
+
     if not has_any:
-        title = f"[MARKET SCAN] {datetime.now().strftime('%Y-%m-%d %H:%M')} - Sin oportunidades"
-        body = f"""## Scan de Mercado - {datetime.now().strftime('%Y-%m-%d %H:%M')}
+        title = f"[MARKET SCAN] {scan_time} - Sin oportunidades"
+        body = f"""## Scan de Mercado - {scan_time}
 
 ### Regimen de Mercado
 - **Estado**: {ms.get('market_regime', 'N/A')}
@@ -1440,7 +1635,7 @@ def create_github_issue_body(scan_result: dict) -> tuple:
             top_short = shorts[0]
             title = f"[ALERTA CORTO] {top_short['symbol']} - Score {top_short['total_score']:.0f}/100"
 
-        body = f"""## ALERTA DE OPORTUNIDAD — Investment Advisor v3.0
+        body_parts = [f"""## ALERTA DE OPORTUNIDAD — Investment Advisor v3.0
 
 ### Regimen de Mercado
 - **Estado**: {ms.get('market_regime', 'N/A')}
@@ -1449,17 +1644,17 @@ def create_github_issue_body(scan_result: dict) -> tuple:
 
 ---
 
-"""
+"""]
         # Sección LONG
         if opps:
-            body += "## 📈 OPORTUNIDADES LONG\n\n"
+            body_parts.append("## 📈 OPORTUNIDADES LONG\n\n")
             for opp in opps:
                 setup = opp.get("trade_setup", {}) or {}
                 breakdown = opp.get("breakdown", {})
                 reasoning = opp.get("reasoning", {})
                 mc = opp.get('market_cap') or 0
 
-                body += f"""### {opp['symbol']} — Score: {opp['total_score']:.0f}/100
+                body_parts.append(f"""### {opp['symbol']} — Score: {opp['total_score']:.0f}/100
 
 | Métrica | Valor |
 |---------|-------|
@@ -1476,9 +1671,10 @@ def create_github_issue_body(scan_result: dict) -> tuple:
 | Tendencia (Seykota) | {breakdown.get('seykota', 0)} | 20 |
 | Catalizador+PEAD+Squeeze | {breakdown.get('catalyst', 0)} | 25 |
 | Risk/Reward | {breakdown.get('risk_reward', 0)} | 15 |
-"""
-                if breakdown.get('sector_adjustment', 0) != 0:
-                    body += f"| Ajuste sector | {breakdown.get('sector_adjustment', 0):+d} | — |\n"
+""")
+                sector_adjustment = breakdown.get('sector_adjustment', 0)
+                if sector_adjustment != 0:
+                    body_parts.append(f"| Ajuste sector | {sector_adjustment:+d} | — |\n")
 
                 # Datos EDGAR Form 4 si disponibles
                 edgar = opp.get("edgar_data", {})
@@ -1488,17 +1684,16 @@ def create_github_issue_body(scan_result: dict) -> tuple:
                     cluster = edgar.get("edgar_insider_cluster_buy", False)
                     if edgar_buys > 0:
                         cluster_tag = " ⭐ CLUSTER BUY" if cluster else ""
-                        body += f"\n**SEC EDGAR Form 4 (últimos 30d):** {edgar_buys} compras insider, {edgar_unique} insiders únicos{cluster_tag}\n"
+                        body_parts.append(f"\n**SEC EDGAR Form 4 (últimos 30d):** {edgar_buys} compras insider, {edgar_unique} insiders únicos{cluster_tag}\n")
 
-                body += "\n**Razonamiento:**\n\n"
+                body_parts.append("\n**Razonamiento:**\n\n")
                 for component, reasons in reasoning.items():
                     if reasons:
-                        body += f"**{component.capitalize()}:**\n"
-                        for reason in reasons:
-                            body += f"- {reason}\n"
-                        body += "\n"
+                        body_parts.append(f"**{component.capitalize()}:**\n")
+                        body_parts.extend(f"- {reason}\n" for reason in reasons)
+                        body_parts.append("\n")
 
-                body += f"""
+                body_parts.append(f"""
 **Trade Setup (LONG):**
 - **Entry**: ${setup.get('entry', 'N/A')}
 - **Stop Loss**: ${setup.get('stop', 'N/A')} (-{setup.get('stop_pct', 'N/A')}%)
@@ -1508,17 +1703,17 @@ def create_github_issue_body(scan_result: dict) -> tuple:
 
 ---
 
-"""
+""")
 
         # Sección SHORT
         if shorts:
-            body += "## 📉 OPORTUNIDADES SHORT\n\n"
+            body_parts.append("## 📉 OPORTUNIDADES SHORT\n\n")
             for s in shorts:
                 setup = s.get("trade_setup") or {}
                 breakdown = s.get("breakdown", {})
                 reasoning = s.get("reasoning", {})
 
-                body += f"""### {s['symbol']} [CORTO] — Score: {s['total_score']:.0f}/100
+                body_parts.append(f"""### {s['symbol']} [CORTO] — Score: {s['total_score']:.0f}/100
 
 **Desglose del Comité de Cortos:**
 | Componente | Score | Max |
@@ -1529,14 +1724,13 @@ def create_github_issue_body(scan_result: dict) -> tuple:
 | PEAD Miss (académico) | {breakdown.get('pead_miss', 0)} | 25 |
 
 **Razonamiento:**
-"""
+""")
                 for component, reasons in reasoning.items():
                     if reasons:
-                        body += f"\n**{component.capitalize()}:**\n"
-                        for reason in reasons:
-                            body += f"- {reason}\n"
+                        body_parts.append(f"\n**{component.capitalize()}:**\n")
+                        body_parts.extend(f"- {reason}\n" for reason in reasons)
 
-                body += f"""
+                body_parts.append(f"""
 **Trade Setup (CORTO):**
 - **Entry**: ${setup.get('entry', 'N/A')}
 - **Stop Loss**: ${setup.get('stop', 'N/A')} (+{setup.get('stop_pct', 'N/A')}% arriba)
@@ -1547,14 +1741,15 @@ def create_github_issue_body(scan_result: dict) -> tuple:
 
 ---
 
-"""
+""")
 
-        body += """
+        body_parts.append("""
 > **DISCLAIMER**: Esto NO es consejo financiero. Trading con apalancamiento conlleva riesgo de pérdida total del capital.
 
 ---
 *Generado automaticamente por Investment Advisor v3.0 (Long+Short)*
-"""
+""")
+        body = "".join(body_parts)
 
     return title, body
 
@@ -1592,8 +1787,8 @@ def main():
     }
 
     # Escribir a archivo para que el workflow lo use
-    with open("scan_output.json", "w") as f:
-        json.dump(output, f, indent=2, default=str)
+    with open("scan_output.json", "wb") as f:
+        f.write(_json_dumps(output))
 
     print(f"\nResultado guardado en scan_output.json")
     print(f"Oportunidades LONG: {n_longs} | Oportunidades SHORT: {n_shorts}")
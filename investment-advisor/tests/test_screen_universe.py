@@ -0,0 +1,83 @@
+"""
+screen_universe con pool de procesos: el intérprete debe terminar
+
+El reasoning de los candidatos se reparte en un ProcessPoolExecutor después de que
+los kernels prange de batch.py hayan arrancado el pool de hilos de numba. Con el
+contexto fork el hijo heredaba ese pool y el proceso se quedaba colgado al salir,
+así que la prueba corre en un subproceso con timeout.
+
+Uso (desde investment-advisor/):
+    python -m unittest discover -s tests
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+SRC_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+_SCRIPT = """
+import random
+import sys
+
+sys.path.insert(0, {src_dir!r})
+
+from committee import evaluate_opportunity_batch, screen_universe
+
+
+def gen_ticker(rng):
+    price = rng.uniform(5, 400)
+    return {{
+        "price": price,
+        "high_20d": price * rng.uniform(0.9, 1.05),
+        "avg_volume_20d": rng.uniform(1e6, 5e7),
+        "volume": rng.uniform(1e6, 8e7),
+        "atr_14": price * rng.uniform(0.01, 0.06),
+        "52w_high": price * rng.uniform(1.0, 1.5),
+        "52w_low": price * rng.uniform(0.3, 0.8),
+        "price_60d_ago": price * rng.uniform(0.5, 1.1),
+        "spy_price_60d_ago": 450.0,
+        "spy_price": 470.0,
+        "ema_20": price * rng.uniform(0.9, 1.0),
+        "ema_50": price * rng.uniform(0.85, 0.95),
+        "ema_200": price * rng.uniform(0.7, 0.9),
+        "price_10d_ago": price * rng.uniform(0.85, 1.0),
+        "sma_150": price * rng.uniform(0.8, 0.95),
+        "sma_150_20d_ago": price * rng.uniform(0.75, 0.9),
+        "beta": rng.uniform(0.8, 2.5),
+        "change_pct": rng.uniform(-2, 6),
+        "sector": "Technology",
+    }}
+
+
+if __name__ == "__main__":
+    rng = random.Random(7)
+    tickers = {{f"T{{i}}": gen_ticker(rng) for i in range(200)}}
+    catalysts = {{t: {{"type": "earnings", "days_ahead": 5}} for t in tickers}}
+    market = {{"vix": 14, "spy_above_200ema": True, "advance_decline_ratio": 1.5}}
+
+    screened = screen_universe(list(tickers.items()), market, catalysts, max_workers=2)
+    expected = evaluate_opportunity_batch(tickers, market, catalysts)
+    reportable = sum(1 for r in screened.values() if r["decision"] in ("BUY", "WATCHLIST"))
+    print(screened == expected, reportable)
+"""
+
+
+class ScreenUniverseProcessPoolTest(unittest.TestCase):
+
+    def test_process_pool_exits_and_matches_batch(self):
+        result = subprocess.run(
+            [sys.executable, "-c", _SCRIPT.format(src_dir=SRC_DIR)],
+            capture_output=True, text=True, timeout=120
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        same, reportable = result.stdout.split()[-2:]
+        self.assertEqual(same, "True")
+        # Con menos de 2 * _MIN_ROWS_PER_WORKER candidatos no se usaría el pool
+        self.assertGreaterEqual(int(reportable), 16)
+
+
+if __name__ == "__main__":
+    unittest.main()